@@ -1,21 +1,23 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
-import time
 from PIL import Image
 import os
 from backend import (
-    extract_pdf_text, 
-    calculate_ats_score, 
-    save_participant_application,
+    enqueue_submission,
+    get_submission_status,
     get_leaderboard,
     get_competition_stats,
-    register_participant,
-    check_participant_exists,
+    register_or_get_participant,
     get_participant_upload_count,
-    get_participant_scores
+    get_participant_scores,
+    MAX_UPLOADS,
+    get_read_cache_stats,
+    get_job_profile_cache_stats,
+    get_scoring_queue_stats,
+    get_metrics_text,
+    start_metrics_server,
+    METRICS_ENABLED,
+    is_admin
 )
 
 try:
@@ -33,6 +35,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+start_metrics_server()
+
 if 'registered' not in st.session_state:
     st.session_state.registered = False
 if 'participant_id' not in st.session_state:
@@ -41,8 +45,12 @@ if 'participant_data' not in st.session_state:
     st.session_state.participant_data = {}
 if 'upload_count' not in st.session_state:
     st.session_state.upload_count = 0
+    st.session_state.upload_count_loaded = False
 if 'last_submission_time' not in st.session_state:
     st.session_state.last_submission_time = None
+if 'scoring_job' not in st.session_state:
+    st.session_state.scoring_job = None
+    st.session_state.scoring_error = None
 
 st.markdown("""
     <style>
@@ -505,6 +513,109 @@ def show_logo_header(title):
     else:
         st.markdown(f"<div class='logo-header'><div class='logo-title'>{title}</div></div>", unsafe_allow_html=True)
 
+def show_submission_result(result, upload_count, max_uploads):
+    import plotly.graph_objects as go
+    
+    st.success(f"✅ Submission {upload_count}/{max_uploads} successful!")
+    
+    score = result['score']
+    if score >= 80:
+        verdict = "Excellent Match"
+    elif score >= 60:
+        verdict = "Good Match"
+    else:
+        verdict = "Needs Improvement"
+    
+    st.markdown(f"""
+        <div class="score-display">
+            <div class="score-number">{score:.1f}%</div>
+            <div class="score-label">{verdict}</div>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Match Score", 'font': {'size': 24, 'color': '#19395D', 'family': 'Poppins'}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': '#19395D'},
+            'bar': {'color': "#5BC0DE", 'thickness': 0.8},
+            'steps': [
+                {'range': [0, 60], 'color': "rgba(244, 67, 54, 0.2)"},
+                {'range': [60, 80], 'color': "rgba(255, 193, 7, 0.2)"},
+                {'range': [80, 100], 'color': "rgba(76, 175, 80, 0.2)"}
+            ],
+            'threshold': {
+                'line': {'color': "#1E5796", 'width': 6},
+                'thickness': 0.85,
+                'value': 85
+            }
+        }
+    ))
+    fig.update_layout(
+        height=380,
+        margin=dict(l=20, r=20, t=70, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font={'color': '#19395D', 'family': 'Poppins', 'size': 14}
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("### Analysis Summary")
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.metric("Skills Detected", f"{len(result['skills'])} skills", 
+                 delta="High" if len(result['skills']) >= 5 else "Low")
+    with col_b:
+        st.metric("Experience", f"{result['experience_years']} years",
+                 delta="Strong" if result['experience_years'] >= 3 else "Entry")
+    
+    if result['skills']:
+        st.markdown("### Detected Skills")
+        skills_html = "".join([
+            f'<span class="skill-tag">{skill}</span>'
+            for skill in result['skills']
+        ])
+        st.markdown(f'<div style="text-align: center;">{skills_html}</div>', unsafe_allow_html=True)
+    
+    if result.get('penalties'):
+        st.markdown("### ⚠ Warnings")
+        for penalty in result['penalties']:
+            st.warning(penalty)
+
+SUBMISSION_STAGES = {
+    'queued': ("⏳ Waiting for a scoring slot...", 10),
+    'extract': ("📄 Reading your resume...", 20),
+    'parse': ("🤖 Analyzing with AI engine...", 40),
+    'score': ("📊 Calculating your score...", 60),
+    'save': ("💾 Saving results...", 80),
+    'done': ("✅ Done", 100)
+}
+
+# Polls the background scoring job once a second without rerunning the page
+@st.fragment(run_every=1)
+def show_scoring_progress():
+    job = get_submission_status(st.session_state.scoring_job)
+    if job is None:
+        job = {'stage': 'error', 'error': "Submission status was lost. Please submit again."}
+    
+    if job['stage'] == 'done':
+        result = job['result']
+        st.session_state.upload_count = result['upload_count']
+        st.session_state.last_submission_time = datetime.now()
+        st.session_state.last_result = result
+        st.session_state.scoring_job = None
+        st.rerun()
+    elif job['stage'] == 'error':
+        st.session_state.scoring_error = job['error']
+        # Another tab may have used uploads; re-read the count on the next run
+        st.session_state.upload_count_loaded = False
+        st.session_state.scoring_job = None
+        st.rerun()
+    
+    label, percent = SUBMISSION_STAGES[job['stage']]
+    st.progress(percent, text=label)
+
 if not st.session_state.registered:
     if logo_exists and logo_image:
         st.markdown('<div class="logo-fixed">', unsafe_allow_html=True)
@@ -560,21 +671,18 @@ if not st.session_state.registered:
                         st.error(error)
                 else:
                     with st.spinner("Registering participant..."):
-                        time.sleep(0.8)
+                        participant = register_or_get_participant(name, email, mobile)
                         
-                        existing = check_participant_exists(email)
+                        if not participant:
+                            st.error("Registration failed. Please try again.")
+                            st.stop()
                         
-                        if existing:
-                            participant_id = existing['id']
-                            st.info("Welcome back! You are already registered.")
-                        else:
-                            participant_id = register_participant(name, email, mobile)
-                            
-                            if not participant_id:
-                                st.error("Registration failed. Please try again.")
-                                st.stop()
-                            
+                        participant_id = participant['id']
+                        upload_count = participant['upload_count']
+                        if participant['created']:
                             st.success("Registration Successful!")
+                        else:
+                            st.info("Welcome back! You are already registered.")
                         
                         st.session_state.registered = True
                         st.session_state.participant_id = participant_id
@@ -583,9 +691,10 @@ if not st.session_state.registered:
                             'email': email,
                             'mobile': mobile
                         }
-                        st.session_state.upload_count = get_participant_upload_count(participant_id)
-                        
-                        time.sleep(1)
+                        if upload_count is None:
+                            upload_count = get_participant_upload_count(participant_id)
+                        st.session_state.upload_count = upload_count
+                        st.session_state.upload_count_loaded = True
                         st.rerun()
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -604,11 +713,12 @@ if not st.session_state.registered:
         """, unsafe_allow_html=True)
 
 else:
-    if 'upload_count' not in st.session_state or st.session_state.upload_count == 0:
+    # Loaded once per session and then counted locally; the database enforces the limit
+    if not st.session_state.get('upload_count_loaded'):
         st.session_state.upload_count = get_participant_upload_count(st.session_state.participant_id)
+        st.session_state.upload_count_loaded = True
     
     upload_count = st.session_state.upload_count
-    MAX_UPLOADS = 5
     
     with st.sidebar:
         if logo_exists and logo_image:
@@ -640,9 +750,12 @@ else:
         
         st.markdown("---")
         st.markdown("### Navigation")
+        pages = ["Submit Application", "My Scores", "Leaderboard", "Competition Stats"]
+        if is_admin(st.session_state.participant_data.get('email')):
+            pages.append("Admin")
         page = st.radio(
             "",
-            ["Submit Application", "My Scores", "Leaderboard", "Competition Stats"],
+            pages,
             label_visibility="collapsed"
         )
         
@@ -652,12 +765,27 @@ else:
             st.session_state.participant_id = None
             st.session_state.participant_data = {}
             st.session_state.upload_count = 0
+            st.session_state.upload_count_loaded = False
             st.session_state.last_submission_time = None
+            st.session_state.scoring_job = None
+            st.session_state.scoring_error = None
             st.rerun()
     
     if page == "Submit Application":
         show_logo_header("Submit Your Resume")
         
+        last_result = st.session_state.pop('last_result', None)
+        if last_result:
+            show_submission_result(last_result, upload_count, MAX_UPLOADS)
+        
+        scoring_error = st.session_state.pop('scoring_error', None)
+        if scoring_error:
+            st.error(f"❌ Error: {scoring_error}")
+        
+        if st.session_state.scoring_job:
+            show_scoring_progress()
+            st.stop()
+        
         if upload_count >= MAX_UPLOADS:
             st.markdown(f"""
                 <div class="glass-card-dark">
@@ -705,119 +833,19 @@ else:
             
             if st.button("Submit & Calculate Score", type="primary", use_container_width=True, disabled=submit_disabled):
                 if uploaded_file and job_description:
+                    job_id = None
                     try:
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        status_text.text("📄 Reading your resume...")
-                        progress_bar.progress(20)
-                        time.sleep(0.4)
-                        
-                        text = extract_pdf_text(uploaded_file)
-                        
-                        status_text.text("🤖 Analyzing with AI engine...")
-                        progress_bar.progress(50)
-                        time.sleep(0.6)
-                        
-                        result = calculate_ats_score(text, job_description)
-                        
-                        status_text.text("💾 Saving results...")
-                        progress_bar.progress(80)
-                        time.sleep(0.4)
-                        
-                        save_success = save_participant_application(
-                            result['score'],
-                            result['skills'],
-                            result['experience_years'],
-                            st.session_state.participant_id
+                        job_id = enqueue_submission(
+                            st.session_state.participant_id,
+                            uploaded_file,
+                            job_description
                         )
-                        
-                        if not save_success:
-                            st.error("Failed to save application. Please try again.")
-                            progress_bar.empty()
-                            status_text.empty()
-                            st.stop()
-                        
-                        st.session_state.upload_count += 1
-                        st.session_state.last_submission_time = datetime.now()
-                        
-                        progress_bar.progress(100)
-                        time.sleep(0.3)
-                        progress_bar.empty()
-                        status_text.empty()
-                        
-                        st.success(f"✅ Submission {st.session_state.upload_count}/{MAX_UPLOADS} successful!")
-                        
-                        score = result['score']
-                        if score >= 80:
-                            verdict = "Excellent Match"
-                        elif score >= 60:
-                            verdict = "Good Match"
-                        else:
-                            verdict = "Needs Improvement"
-                        
-                        st.markdown(f"""
-                            <div class="score-display">
-                                <div class="score-number">{score:.1f}%</div>
-                                <div class="score-label">{verdict}</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        fig = go.Figure(go.Indicator(
-                            mode="gauge+number",
-                            value=score,
-                            domain={'x': [0, 1], 'y': [0, 1]},
-                            title={'text': "Match Score", 'font': {'size': 24, 'color': '#19395D', 'family': 'Poppins'}},
-                            gauge={
-                                'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': '#19395D'},
-                                'bar': {'color': "#5BC0DE", 'thickness': 0.8},
-                                'steps': [
-                                    {'range': [0, 60], 'color': "rgba(244, 67, 54, 0.2)"},
-                                    {'range': [60, 80], 'color': "rgba(255, 193, 7, 0.2)"},
-                                    {'range': [80, 100], 'color': "rgba(76, 175, 80, 0.2)"}
-                                ],
-                                'threshold': {
-                                    'line': {'color': "#1E5796", 'width': 6},
-                                    'thickness': 0.85,
-                                    'value': 85
-                                }
-                            }
-                        ))
-                        fig.update_layout(
-                            height=380,
-                            margin=dict(l=20, r=20, t=70, b=20),
-                            paper_bgcolor='rgba(0,0,0,0)',
-                            font={'color': '#19395D', 'family': 'Poppins', 'size': 14}
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        st.markdown("### Analysis Summary")
-                        col_a, col_b = st.columns(2)
-                        with col_a:
-                            st.metric("Skills Detected", f"{len(result['skills'])} skills", 
-                                     delta="High" if len(result['skills']) >= 5 else "Low")
-                        with col_b:
-                            st.metric("Experience", f"{result['experience_years']} years",
-                                     delta="Strong" if result['experience_years'] >= 3 else "Entry")
-                        
-                        if result['skills']:
-                            st.markdown("### Detected Skills")
-                            skills_html = "".join([
-                                f'<span class="skill-tag">{skill}</span>'
-                                for skill in result['skills']
-                            ])
-                            st.markdown(f'<div style="text-align: center;">{skills_html}</div>', unsafe_allow_html=True)
-                        
-                        if result.get('penalties'):
-                            st.markdown("### ⚠ Warnings")
-                            for penalty in result['penalties']:
-                                st.warning(penalty)
-                        
-                        time.sleep(1.5)
-                        st.rerun()
-                        
                     except Exception as e:
                         st.error(f"❌ Error: {str(e)}")
+                    
+                    if job_id:
+                        st.session_state.scoring_job = job_id
+                        st.rerun()
                 else:
                     st.warning("⚠️ Please upload resume and enter job description")
             
@@ -855,6 +883,8 @@ else:
             st.markdown('</div>', unsafe_allow_html=True)
     
     elif page == "My Scores":
+        import pandas as pd
+        
         show_logo_header("My Score History")
         
         my_scores = get_participant_scores(st.session_state.participant_id)
@@ -975,6 +1005,9 @@ else:
             """, unsafe_allow_html=True)
     
     elif page == "Competition Stats":
+        import pandas as pd
+        import plotly.express as px
+        
         show_logo_header("Competition Statistics")
         
         stats = get_competition_stats()
@@ -1045,4 +1078,38 @@ else:
                     <h3 style='color: white; text-align: center;'>Coming Soon</h3>
                     <p style='text-align: center; opacity: 0.9;'>Statistics will appear once participants start submitting</p>
                 </div>
-            """, unsafe_allow_html=True)
\ No newline at end of file
+            """, unsafe_allow_html=True)
+    
+    elif page == "Admin":
+        import pandas as pd
+        
+        show_logo_header("Admin")
+        
+        st.markdown('<div class="card-header">Read Cache</div>', unsafe_allow_html=True)
+        read_stats = get_read_cache_stats()
+        if read_stats:
+            df_cache = pd.DataFrame(read_stats)
+            df_cache['hit_rate'] = (df_cache['hit_rate'] * 100).round(1).astype(str) + '%'
+            st.dataframe(df_cache, use_container_width=True, hide_index=True)
+        else:
+            st.info("No cached reads yet")
+        
+        st.markdown('<div class="card-header">Job Description Cache</div>', unsafe_allow_html=True)
+        jd_stats = get_job_profile_cache_stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Profiles", f"{jd_stats['size']}/{jd_stats['max_size']}")
+        col2.metric("Hits", jd_stats['hits'])
+        col3.metric("Misses", jd_stats['misses'])
+        col4.metric("Hit Rate", f"{jd_stats['hit_rate'] * 100:.1f}%")
+        
+        st.markdown('<div class="card-header">Scoring Queue</div>', unsafe_allow_html=True)
+        queue_stats = get_scoring_queue_stats()
+        col1, col2 = st.columns(2)
+        col1.metric("Workers", queue_stats['workers'])
+        col2.metric("Queued or Running", f"{queue_stats['pending']}/{queue_stats['max_pending']}")
+        
+        st.markdown('<div class="card-header">Metrics</div>', unsafe_allow_html=True)
+        if METRICS_ENABLED:
+            st.code(get_metrics_text(), language="text")
+        else:
+            st.info("Stage metrics are off. Set ATS_METRICS=1 and restart the app to record them.")
\ No newline at end of file
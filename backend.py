@@ -1,39 +1,63 @@
-import pymupdf
-import spacy
 import re
 import streamlit as st
 from datetime import datetime
-import pandas as pd
-from supabase import create_client, Client
 import uuid
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+import base64
+import io
 import logging
+from skills import get_skill_matcher
+from pdf_cache import DocumentCache, content_hash
+from read_cache import cached_read, read_cache
+from metrics import (
+    ENABLED as METRICS_ENABLED,
+    METRICS_PORT,
+    record_error,
+    record_size,
+    render_prometheus,
+    start_http_server,
+    timed,
+)
+from ner import NER_VERSION, extract_entities, load_pipeline, model_key
+from ingest import iter_page_text, open_pdf, spool_pdf
+from sections import segment_sections
+from rules import (
+    MAX_EXPERIENCE_YEARS,
+    cgpa_claims,
+    date_ranges,
+    education_terms,
+    employment_intervals,
+    months_covered,
+    stated_experience_years,
+)
+from job_profiles import (
+    EDUCATION_DEGREES,
+    EDUCATION_FIELDS,
+    JobProfileCache,
+    keyword_similarity,
+    term_counts,
+)
 
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
-# Spacy NLP
+# Spacy NER pipeline, loaded on first use with every other component disabled.
+# Entity extraction is optional: without the model, parsing falls back to patterns.
 @st.cache_resource
-def load_nlp():
+def get_nlp():
     try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        logger.error("Spacy model not found")
-        st.error("⚠️ NLP model not available. Please install: python -m spacy download en_core_web_sm")
-        return None
+        return load_pipeline()
     except Exception as e:
         logger.error(f"Error loading spacy: {e}")
-        st.error(f"⚠️ Error loading NLP model: {str(e)}")
         return None
 
-nlp = load_nlp()
-
-# Supabase client
+# Supabase client, created on first database access rather than at import.
+# pymupdf, pandas, scikit-learn and the plagiarism index are likewise imported
+# inside the functions that use them, so pages that need none of them (such
+# as registration) render without paying for those imports.
 @st.cache_resource
 def get_supabase_client():
     try:
+        from supabase import create_client
         url = st.secrets["SUPABASE_URL"]
         key = st.secrets["SUPABASE_KEY"]
         return create_client(url, key)
@@ -46,7 +70,28 @@ def get_supabase_client():
         st.error(f"⚠️ Database connection failed: {str(e)}")
         return None
 
-supabase: Client = get_supabase_client()
+# Bump when parse_resume output changes so cached parses are not reused
+PARSER_VERSION = 6
+
+# Preprocessed job descriptions shared by every session in this process
+job_profile_cache = JobProfileCache(max_size=256)
+
+# Rebuild the plagiarism index from the database every 15 minutes
+PLAGIARISM_REBUILD_INTERVAL = 15 * 60
+
+# Resumes per page when streaming the corpus; PostgREST caps responses at 1000 rows by default
+CORPUS_PAGE_SIZE = 500
+
+MAX_PDF_SIZE = 20 * 1024 * 1024
+
+# Also enforced by the applications insert trigger in supabase_schema.txt
+MAX_UPLOADS = 5
+UPLOAD_LIMIT_ERROR = "Upload limit reached"
+
+# How long dashboard reads are served from the process-wide read cache
+LEADERBOARD_TTL = 10
+STATS_TTL = 30
+PARTICIPANT_SCORES_TTL = 60
 
 # PDF validation
 def validate_pdf_file(uploaded_file):
@@ -54,7 +99,7 @@ def validate_pdf_file(uploaded_file):
         return False, "No file uploaded"
     if uploaded_file.type != "application/pdf":
         return False, "File must be a PDF"
-    if uploaded_file.size > 20 * 1024 * 1024:
+    if uploaded_file.size > MAX_PDF_SIZE:
         return False, "File size exceeds 20MB limit"
     return True, "Valid"
 
@@ -64,117 +109,155 @@ def extract_pdf_text(uploaded_file):
         if not is_valid:
             raise Exception(message)
         
-        pdf_bytes = uploaded_file.read()
-        doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
-        text = "".join([page.get_text() + "\n" for page in doc])
-        doc.close()
-        
-        if not text.strip():
-            raise Exception("PDF appears to be empty or contains only images")
-        
-        return text
+        uploaded_file.seek(0)
+        return extract_pdf_stream(uploaded_file)
     except Exception as e:
         logger.error(f"PDF extraction error: {e}")
         raise Exception(f"PDF extraction error: {str(e)}")
 
-def parse_resume(text):
-    if not nlp:
-        raise Exception("NLP model not available")
+@st.cache_resource
+def get_document_cache():
+    """On-disk cache of extracted text and parsed resumes, keyed by content hash"""
+    try:
+        return DocumentCache()
+    except Exception as e:
+        logger.error(f"Document cache unavailable: {e}")
+        return None
+
+def extract_pdf_bytes(pdf_bytes):
+    """Extract text from raw PDF bytes, reusing the text of identical earlier uploads"""
+    return extract_pdf_stream(io.BytesIO(pdf_bytes))
+
+@timed('extract_pdf')
+def extract_pdf_stream(stream):
+    """
+    Extract text from a PDF file object, reusing the text of identical earlier uploads.
+    
+    The file is spooled to disk in chunks and hashed as it is copied, so a
+    cached document is never opened and an oversized or non-PDF file is
+    rejected before it is read in full.
+    """
+    cache = get_document_cache()
+    
+    with spool_pdf(stream, MAX_PDF_SIZE) as spooled:
+        record_size('pdf_bytes', spooled.size)
+        if cache:
+            try:
+                text = cache.get_text(spooled.sha256)
+                if text is not None:
+                    return text
+            except Exception as e:
+                logger.error(f"Document cache read error: {e}")
+        
+        with open_pdf(spooled) as doc:
+            record_size('pdf_pages', doc.page_count)
+            text = "".join(iter_page_text(doc))
+        pdf_hash = spooled.sha256
+    
+    if not text.strip():
+        raise Exception("PDF appears to be empty or contains only images")
+    
+    if cache:
+        try:
+            cache.put_text(pdf_hash, text)
+        except Exception as e:
+            logger.error(f"Document cache write error: {e}")
     
+    return text
+
+@timed('parse_resume')
+def parse_resume(text, entities=None):
+    """
+    Skills, experience, sections and entities of a resume.
+    
+    `entities` is this text's result from extract_entities, for callers that
+    have already run a batch through the NER pipeline.
+    """
     if not text or len(text.strip()) < 100:
         raise Exception("Resume text is too short or empty")
     
-    skills_list = [
-        'Python', 'Java', 'JavaScript', 'SQL', 'AWS', 'Docker', 'Kubernetes',
-        'React', 'Node.js', 'Django', 'Flask', 'PostgreSQL', 'MongoDB',
-        'Machine Learning', 'Data Science', 'Git', 'CI/CD', 'Agile', 'Scrum',
-        'C++', 'C#', 'Ruby', 'PHP', 'Swift', 'Kotlin', 'TypeScript',
-        'Angular', 'Vue.js', 'Spring', 'TensorFlow', 'PyTorch', 'Pandas',
-        'NumPy', 'Scikit-learn', 'Spark', 'Hadoop', 'Kafka', 'Redis',
-        'Elasticsearch', 'GraphQL', 'REST API', 'Microservices', 'HTML',
-        'CSS', 'Bootstrap', 'Tailwind', 'Azure', 'GCP', 'Jenkins', 'Ansible'
-    ]
-    
-    text_lower = text.lower()
-    skills = []
-    seen_skills = set()
+    matcher = get_skill_matcher()
+    nlp = get_nlp()
+    cache = get_document_cache()
+    # Entities are part of the result, so the model that found them is in the key
+    cache_key = f"{content_hash(text)}:{matcher.fingerprint}:{model_key(nlp)}:{NER_VERSION}:{PARSER_VERSION}"
     
-    for skill in skills_list:
-        if skill.lower() in text_lower and skill.lower() not in seen_skills:
-            skills.append(skill)
-            seen_skills.add(skill.lower())
+    if cache:
+        try:
+            cached = cache.get_parsed(cache_key)
+            if cached is not None:
+                return cached
+        except Exception as e:
+            logger.error(f"Document cache read error: {e}")
     
-    experience_patterns = [
-        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-        r'experience[:\s]+(\d+)\+?\s*years?',
-        r'(\d+)\+?\s*years?\s+in\s+',
-        r'worked\s+for\s+(\d+)\+?\s*years?'
-    ]
+    skill_matches = matcher.scan(text)
+    sections = segment_sections(text)
     
-    experience_years = 0
-    for pattern in experience_patterns:
-        matches = re.findall(pattern, text_lower)
-        if matches:
-            exp_values = [int(m) for m in matches if int(m) <= 50]
-            if exp_values:
-                experience_years = max(experience_years, max(exp_values))
+    if entities is None:
+        entities = extract_entities([text], nlp, cache)[0]
     
-    projects_section = extract_section(text, ['project', 'projects'])
-    education_section = extract_section(text, ['education', 'academic', 'qualification'])
+    # Employment periods from date ranges in the experience section and from
+    # NER, with overlapping jobs counted once
+    intervals = [(first, last) for first, last, _, _ in date_ranges(text, *sections.get('experience', (0, 0)))]
+    intervals += employment_intervals(entities['employment'])
+    employment_years = min(months_covered(intervals) // 12, MAX_EXPERIENCE_YEARS)
+    experience_years = max(stated_experience_years(text), employment_years)
     
-    return {
-        'skills': skills,
+    parsed = {
+        'skills': skill_matches['skills'],
+        'skill_counts': skill_matches['counts'],
+        'skill_offsets': skill_matches['offsets'],
         'experience_years': experience_years,
-        'projects_section': projects_section,
-        'education_section': education_section
+        'sections': sections,
+        'organizations': entities['organizations'],
+        'degrees': entities['degrees'],
+        'employment': entities['employment']
     }
-
-def extract_section(text, keywords):
-    if not text:
-        return ""
     
-    lines = text.split('\n')
-    section_text = ""
-    capturing = False
-    
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        
-        if any(kw in line_lower for kw in keywords):
-            capturing = True
-            continue
-        
-        if capturing and line_lower and line.strip().isupper() and len(line.strip()) < 50:
-            break
-        
-        if capturing:
-            section_text += line + "\n"
+    if cache:
+        try:
+            cache.put_parsed(cache_key, parsed)
+        except Exception as e:
+            logger.error(f"Document cache write error: {e}")
     
-    return section_text.strip()
+    return parsed
 
-def validate_projects(projects_section, skills):
-    if not projects_section or not skills:
+def validate_projects(projects_span, skill_offsets, skills):
+    """Share of `skills` that also occur within the projects section span"""
+    start, end = projects_span
+    if end <= start or not skills:
         return 0, []
     
-    projects_lower = projects_section.lower()
-    verified_skills = [s for s in skills if s.lower() in projects_lower]
+    verified_skills = [
+        s for s in skills
+        if any(start <= offset < end for offset in skill_offsets.get(s, ()))
+    ]
     verification_rate = len(verified_skills) / len(skills) if skills else 0
     
     return verification_rate, verified_skills
 
 def validate_education(education_section, jd_education):
+    jd_lower = jd_education.lower() if jd_education else ""
+    jd_degrees = [d for d in EDUCATION_DEGREES if d in jd_lower]
+    jd_fields = [f for f in EDUCATION_FIELDS if f in jd_lower]
+    return score_education(education_section, jd_degrees, jd_fields, bool(jd_lower))
+
+def score_education(text, jd_degrees, jd_fields, has_jd_education, span=None):
+    """
+    Education score against JD degrees/fields that were already extracted.
+    
+    Only `text[start:end]` is considered when a `span` is given; it is
+    searched in place rather than sliced out.
+    """
     score = 0
     penalties = []
+    start, end = span if span is not None else (0, len(text or ""))
     
-    if not education_section:
+    if not text or end <= start:
         return 0, penalties
     
-    edu_lower = education_section.lower()
-    jd_lower = jd_education.lower() if jd_education else ""
-    
-    degrees = ['bachelor', 'b.tech', 'b.e.', 'bsc', 'master', 'm.tech', 'm.sc', 'phd', 'mba']
-    jd_degrees = [d for d in degrees if d in jd_lower]
-    resume_degrees = [d for d in degrees if d in edu_lower]
+    found_terms = education_terms(text, start, end)
+    resume_degrees = [d for d in EDUCATION_DEGREES if d in found_terms]
     
     if jd_degrees and resume_degrees:
         if any(jd_deg in resume_degrees for jd_deg in jd_degrees):
@@ -184,37 +267,22 @@ def validate_education(education_section, jd_education):
     elif resume_degrees and not jd_degrees:
         score += 10
     
-    cgpa_pattern = r'(?:cgpa|gpa|grade)[:\s]*(\d+\.?\d*)\s*(?:/\s*(\d+\.?\d*))?'
-    cgpa_matches = re.findall(cgpa_pattern, edu_lower)
-    
-    for match in cgpa_matches:
-        try:
-            cgpa_value = float(match[0])
-            max_scale = float(match[1]) if match[1] else 10.0
-            
-            if max_scale <= 0:
-                continue
-            
-            if cgpa_value > max_scale:
-                penalties.append(f"Invalid CGPA: {cgpa_value}/{max_scale}")
-                score -= 5
-            elif cgpa_value == max_scale:
-                penalties.append(f"Perfect CGPA claimed: {cgpa_value}/{max_scale}")
-                score -= 2
-            elif cgpa_value > (max_scale * 0.95):
-                penalties.append(f"Suspiciously high CGPA: {cgpa_value}/{max_scale}")
-                score -= 1
-        except (ValueError, ZeroDivisionError):
+    for cgpa_value, max_scale in cgpa_claims(text, start, end):
+        if max_scale <= 0:
             continue
+        
+        if cgpa_value > max_scale:
+            penalties.append(f"Invalid CGPA: {cgpa_value}/{max_scale}")
+            score -= 5
+        elif cgpa_value == max_scale:
+            penalties.append(f"Perfect CGPA claimed: {cgpa_value}/{max_scale}")
+            score -= 2
+        elif cgpa_value > (max_scale * 0.95):
+            penalties.append(f"Suspiciously high CGPA: {cgpa_value}/{max_scale}")
+            score -= 1
     
-    fields = [
-        'computer science', 'software engineering', 'information technology',
-        'electrical engineering', 'electronics', 'data science', 'artificial intelligence'
-    ]
-    
-    if jd_lower:
-        jd_fields = [f for f in fields if f in jd_lower]
-        resume_fields = [f for f in fields if f in edu_lower]
+    if has_jd_education:
+        resume_fields = [f for f in EDUCATION_FIELDS if f in found_terms]
         
         if jd_fields and resume_fields:
             if any(jf in resume_fields for jf in jd_fields):
@@ -224,39 +292,64 @@ def validate_education(education_section, jd_education):
     
     return max(0, score), penalties
 
-def check_plagiarism(resume_text, reference_corpus=None):
-    if not reference_corpus or len(reference_corpus) == 0:
-        return 0, "No reference data"
+@st.cache_resource
+def get_plagiarism_index():
+    """Process-wide plagiarism index, seeded from the stored corpus"""
+    from plagiarism import PlagiarismIndex
+    index = PlagiarismIndex()
+    try:
+        index.rebuild_batches(iter_resume_corpus())
+    except Exception as e:
+        logger.error(f"Plagiarism index build error: {e}")
+    index.start_background_rebuild(iter_resume_corpus, PLAGIARISM_REBUILD_INTERVAL)
+    return index
+
+@timed('check_plagiarism')
+def check_plagiarism(resume_text, reference_corpus=None, participant_id=None):
+    """
+    Return the highest similarity (%) between the resume and previous submissions.
     
+    Uses the shared plagiarism index unless an explicit reference_corpus is given.
+    The participant's own earlier uploads are not compared, so resubmitting an
+    edited resume is not penalised.
+    """
+    from plagiarism import PlagiarismIndex
     try:
-        if not resume_text or not resume_text.strip():
-            return 0, "Empty resume"
+        if reference_corpus is not None:
+            if len(reference_corpus) == 0:
+                return 0, "No reference data"
+            index = PlagiarismIndex()
+            index.rebuild(reference_corpus)
+        else:
+            index = get_plagiarism_index()
         
-        corpus = [resume_text] + reference_corpus
+        record_size('plagiarism_corpus', index.size)
+        if index.size == 0:
+            return 0, "No reference data"
         
-        if len(corpus) < 2:
-            return 0, "Insufficient corpus"
+        if not resume_text or not resume_text.strip():
+            return 0, "Empty resume"
         
-        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=1000)
-        tfidf_matrix = vectorizer.fit_transform(corpus)
-        similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])
-        max_similarity = float(np.max(similarities)) if similarities.size > 0 else 0.0
+        max_similarity = index.query(resume_text, exclude_owner=participant_id)
         plagiarism_score = round(max_similarity * 100, 2)
         
         return plagiarism_score, "Checked"
     except Exception as e:
         logger.error(f"Plagiarism check error: {e}")
+        record_error('check_plagiarism')
         return 0, f"Error: {str(e)}"
 
-def calculate_keyword_similarity(resume_text, job_description):
+@timed('keyword_similarity')
+def calculate_keyword_similarity(resume_text, job_description, jd_term_counts=None):
     """Calculate keyword similarity between resume and JD using TF-IDF"""
     try:
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=100)
-        tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
-        similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+        if jd_term_counts is None:
+            jd_term_counts = term_counts(job_description)
+        similarity = keyword_similarity(term_counts(resume_text), jd_term_counts)
         return round(similarity * 100, 2)
     except Exception as e:
         logger.error(f"Keyword similarity error: {e}")
+        record_error('keyword_similarity')
         return 0
 
 def calculate_resume_quality_score(resume_text, parsed_data):
@@ -271,10 +364,11 @@ def calculate_resume_quality_score(resume_text, parsed_data):
         quality_score += 1
     
     # Sections check
-    if parsed_data.get('projects_section'):
-        quality_score += 2
-    if parsed_data.get('education_section'):
-        quality_score += 2
+    sections = parsed_data.get('sections', {})
+    for name in ('projects', 'education'):
+        start, end = sections.get(name, (0, 0))
+        if end > start:
+            quality_score += 2
     
     # Skills diversity
     skill_count = len(parsed_data.get('skills', []))
@@ -289,7 +383,14 @@ def calculate_resume_quality_score(resume_text, parsed_data):
     
     return min(quality_score, 10)  # Max 10 points
 
-def calculate_ats_score(resume_text, job_description, jd_education="", reference_corpus=None):
+def get_job_profile(job_description, jd_education=""):
+    """Preprocessed JD, memoized across sessions by a normalized fingerprint"""
+    return job_profile_cache.get(job_description, jd_education, get_skill_matcher())
+
+def get_job_profile_cache_stats():
+    return job_profile_cache.stats()
+
+def calculate_ats_score(resume_text, job_description, jd_education="", reference_corpus=None, on_stage=None):
     if not resume_text or not job_description:
         raise Exception("Resume text and job description are required")
     
@@ -299,18 +400,31 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
     if len(job_description.strip()) < 50:
         raise Exception("Job description is too short")
     
+    if on_stage:
+        on_stage('parse')
+    
     try:
         parsed = parse_resume(resume_text)
     except Exception as e:
         raise Exception(f"Resume parsing failed: {str(e)}")
     
+    if on_stage:
+        on_stage('score')
+    
+    jd_profile = get_job_profile(job_description, jd_education)
+    plagiarism_score, plag_status = check_plagiarism(resume_text, reference_corpus)
+    keyword_score = calculate_keyword_similarity(resume_text, job_description, jd_profile.term_counts)
+    
+    return score_parsed_resume(resume_text, parsed, jd_profile, plagiarism_score, plag_status, keyword_score)
+
+@timed('score')
+def score_parsed_resume(resume_text, parsed, jd_profile, plagiarism_score, plag_status, keyword_similarity):
+    """Combine a parsed resume, a prepared JD and the similarity checks into a score"""
     score = 0
     feedback = []
     penalties = []
     
-    jd_lower = job_description.lower()
-    matched_skills = [s for s in parsed['skills'] if s.lower() in jd_lower]
-    
+    matched_skills = [s for s in parsed['skills'] if s in jd_profile.skills]
     if parsed['skills']:
         skills_score = (len(matched_skills) / len(parsed['skills'])) * 40
         score += skills_score
@@ -318,10 +432,7 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
     else:
         feedback.append("No skills detected")
     
-    exp_match = re.search(r'(\d+)\+?\s*years?', job_description.lower())
-    required_exp = int(exp_match.group(1)) if exp_match else 2
-    if required_exp == 0:
-        required_exp = 1
+    required_exp = jd_profile.required_experience
     
     if parsed['experience_years'] >= required_exp:
         score += 20
@@ -333,7 +444,10 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
     else:
         feedback.append("No experience detected")
     
-    project_verification, verified_skills = validate_projects(parsed['projects_section'], parsed['skills'])
+    sections = parsed['sections']
+    project_verification, verified_skills = validate_projects(
+        sections.get('projects', (0, 0)), parsed['skill_offsets'], parsed['skills']
+    )
     project_score = project_verification * 10
     score += project_score
     
@@ -346,7 +460,13 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
         penalties.append("Skills not verified in projects (-3 points)")
         score -= 3
     
-    education_score, edu_penalties = validate_education(parsed['education_section'], jd_education)
+    education_score, edu_penalties = score_education(
+        resume_text,
+        jd_profile.degrees,
+        jd_profile.fields,
+        jd_profile.has_education,
+        span=sections.get('education', (0, 0))
+    )
     score += education_score
     penalties.extend(edu_penalties)
     
@@ -357,12 +477,8 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
     else:
         feedback.append("Education doesn't match requirements")
     
-    # Calculate plagiarism score
-    plagiarism_score = 0
-    plag_status = "Not checked"
-    if reference_corpus:
-        plagiarism_score, plag_status = check_plagiarism(resume_text, reference_corpus)
-        
+    # Apply plagiarism penalties
+    if plag_status == "Checked":
         if plagiarism_score > 80:
             penalties.append(f"High plagiarism detected: {plagiarism_score}% (-20 points)")
             score -= 20
@@ -375,9 +491,6 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
         
         feedback.append(f"Plagiarism check: {plagiarism_score}% similarity")
     
-    # Calculate keyword similarity
-    keyword_similarity = calculate_keyword_similarity(resume_text, job_description)
-    
     # Calculate resume quality score
     resume_quality = calculate_resume_quality_score(resume_text, parsed)
     
@@ -386,7 +499,7 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
         score -= 10
     
     for skill in parsed['skills'][:5]:
-        count = resume_text.lower().count(skill.lower())
+        count = parsed['skill_counts'].get(skill, 0)
         if count > 15:
             penalties.append(f"Keyword stuffing detected: '{skill}' repeated {count} times (-5 points)")
             score -= 5
@@ -406,6 +519,80 @@ def calculate_ats_score(resume_text, job_description, jd_education="", reference
         'resume_quality_score': resume_quality
     }
 
+def calculate_ats_scores_batch(resumes, job_description, jd_education="", plagiarism=False, n_process=1):
+    """
+    Score many resumes against one job description.
+    
+    Parameters:
+    - resumes: list of resume texts, or a dict mapping an ID to each text
+    - job_description: JD text, preprocessed once for the whole batch
+    - jd_education: optional education requirement text
+    - plagiarism: whether to check each resume against the plagiarism index.
+      Off by default, since resumes already submitted would match their own
+      entry; with a dict keyed by participant ID, each resume skips that
+      participant's uploads.
+    - n_process: processes for the NER pipeline, which runs over the batch at once
+    
+    Returns a DataFrame sorted by score. Resumes that cannot be scored keep
+    their row with an `error` and no score.
+    """
+    import pandas as pd
+    if not job_description or len(job_description.strip()) < 50:
+        raise Exception("Job description is too short")
+    
+    items = list(resumes.items()) if hasattr(resumes, 'items') else list(enumerate(resumes))
+    jd_profile = get_job_profile(job_description, jd_education)
+    
+    rows = []
+    valid = []
+    for resume_id, resume_text in items:
+        if not resume_text or len(resume_text.strip()) < 100:
+            rows.append({'resume_id': resume_id, 'error': "Resume text is too short"})
+        else:
+            valid.append((resume_id, resume_text))
+    
+    entities = extract_entities(
+        [text for _, text in valid], get_nlp(), get_document_cache(), n_process=n_process
+    )
+    
+    parsed_resumes = []
+    for (resume_id, resume_text), resume_entities in zip(valid, entities):
+        try:
+            parsed_resumes.append((resume_id, resume_text, parse_resume(resume_text, resume_entities)))
+        except Exception as e:
+            rows.append({'resume_id': resume_id, 'error': str(e)})
+    
+    for resume_id, resume_text, parsed in parsed_resumes:
+        # Scored against the JD alone, so the value matches a single submission
+        keyword_similarity = calculate_keyword_similarity(resume_text, job_description, jd_profile.term_counts)
+        if plagiarism:
+            plagiarism_score, plag_status = check_plagiarism(resume_text, participant_id=resume_id)
+        else:
+            plagiarism_score, plag_status = 0, "Not checked"
+        
+        result = score_parsed_resume(resume_text, parsed, jd_profile, plagiarism_score, plag_status, keyword_similarity)
+        rows.append({
+            'resume_id': resume_id,
+            'score': result['score'],
+            'matched_skills_count': result['matched_skills_count'],
+            'skills_count': len(result['skills']),
+            'matched_skills': result['matched_skills'],
+            'experience_years': result['experience_years'],
+            'keyword_similarity': result['keyword_similarity'],
+            'plagiarism_score': result['plagiarism_score'],
+            'resume_quality_score': result['resume_quality_score'],
+            'penalties': result['penalties'],
+            'error': None
+        })
+    
+    columns = [
+        'resume_id', 'score', 'matched_skills_count', 'skills_count', 'matched_skills',
+        'experience_years', 'keyword_similarity', 'plagiarism_score', 'resume_quality_score',
+        'penalties', 'error'
+    ]
+    df = pd.DataFrame(rows, columns=columns)
+    return df.sort_values('score', ascending=False, na_position='last').reset_index(drop=True)
+
 def sanitize_input(text, max_length=500):
     if not text:
         return ""
@@ -428,7 +615,9 @@ def validate_mobile(mobile):
         return False
     return mobile_clean.isdigit()
 
+@timed('db.register_participant')
 def register_participant(name, email, mobile):
+    supabase = get_supabase_client()
     if not supabase:
         return str(uuid.uuid4())
     
@@ -456,10 +645,13 @@ def register_participant(name, email, mobile):
         return participant_id
     except Exception as e:
         logger.error(f"Registration error: {e}")
+        record_error('db.register_participant')
         st.error(f"Registration error: {str(e)}")
         return None
 
+@timed('db.check_participant_exists')
 def check_participant_exists(email):
+    supabase = get_supabase_client()
     if not supabase:
         return None
     
@@ -472,20 +664,90 @@ def check_participant_exists(email):
         return None
     except Exception as e:
         logger.error(f"Check error: {e}")
+        record_error('db.check_participant_exists')
         st.error(f"Error checking participant: {str(e)}")
         return None
 
+@timed('db.register_or_get_participant')
+def register_or_get_participant(name, email, mobile):
+    """
+    Register a participant, or look up the existing one with the same email.
+    
+    Uses the upsert_participant() RPC so registration is a single round trip.
+    Returns {'id', 'upload_count', 'created'} or None on failure.
+    """
+    supabase = get_supabase_client()
+    try:
+        name = sanitize_input(name, 200)
+        email = sanitize_input(email, 200).lower()
+        mobile = sanitize_input(mobile, 20)
+        
+        if not name or len(name) < 3:
+            raise Exception("Invalid name")
+        if not validate_email(email):
+            raise Exception("Invalid email - must be @thapar.edu")
+        if not validate_mobile(mobile):
+            raise Exception("Invalid mobile number")
+        
+        if not supabase:
+            return {'id': str(uuid.uuid4()), 'upload_count': 0, 'created': True}
+        
+        params = {'p_id': str(uuid.uuid4()), 'p_name': name, 'p_email': email, 'p_mobile': mobile}
+        try:
+            response = supabase.rpc('upsert_participant', params).execute()
+        except Exception as e:
+            if not is_missing_function_error(e):
+                raise
+            # Fallback to lookup then insert if the function isn't deployed
+            existing = check_participant_exists(email)
+            if existing:
+                return {'id': existing['id'], 'upload_count': existing.get('upload_count'), 'created': False}
+            participant_id = register_participant(name, email, mobile)
+            if not participant_id:
+                return None
+            return {'id': participant_id, 'upload_count': 0, 'created': True}
+        
+        data = response.data
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if not data or not data.get('id'):
+            raise Exception("Registration returned no participant")
+        
+        return {
+            'id': data['id'],
+            'upload_count': int(data.get('upload_count') or 0),
+            'created': bool(data.get('created'))
+        }
+    except Exception as e:
+        logger.error(f"Registration error: {e}")
+        record_error('db.register_or_get_participant')
+        st.error(f"Registration error: {str(e)}")
+        return None
+
+def is_missing_function_error(error):
+    """True if a Supabase RPC failed because the function isn't deployed"""
+    message = str(error)
+    return 'PGRST202' in message or 'Could not find the function' in message
+
+@timed('db.save_application')
 def save_participant_application(participant_id, resume_text, ats_result):
     """
     Save application with all schema fields including plagiarism, keyword similarity, and quality score
     
     Parameters:
     - participant_id: UUID of the participant
-    - resume_text: Full text of the resume for plagiarism corpus
+    - resume_text: Full text of the resume, fingerprinted for the plagiarism corpus
     - ats_result: Dictionary containing all ATS scoring results
+    
+    The application and corpus rows are written in one transaction by the
+    submit_application() RPC. Returns the participant's new upload count, or
+    None if the save failed. Raises if the database rejects the insert
+    because the participant has already used all uploads.
     """
+    from plagiarism import encode_fingerprint, fingerprint
+    supabase = get_supabase_client()
     if not supabase:
-        return False
+        return None
     
     try:
         if not participant_id:
@@ -507,64 +769,318 @@ def save_participant_application(participant_id, resume_text, ats_result):
             'resume_quality_score': float(ats_result.get('resume_quality_score', 0))
         }
         
-        # Insert application
-        supabase.table('applications').insert(application_data).execute()
+        # Only the fingerprint is stored for plagiarism checks, not the text
+        resume_fingerprint = fingerprint(resume_text)
+        term_vector, minhash = encode_fingerprint(resume_fingerprint)
+        corpus_data = {'term_vector': to_bytea(term_vector), 'minhash': to_bytea(minhash)}
         
-        # Save resume text to corpus for plagiarism detection
-        corpus_data = {
-            'participant_id': participant_id,
-            'resume_text': resume_text
-        }
-        supabase.table('resume_corpus').insert(corpus_data).execute()
+        try:
+            params = {f'p_{key}': value for key, value in {**application_data, **corpus_data}.items()}
+            response = supabase.rpc('submit_application', params).execute()
+            upload_count = int(response.data)
+        except Exception as e:
+            if not is_missing_function_error(e):
+                raise
+            # Fallback to separate inserts if the function isn't deployed
+            upload_count = save_participant_application_rows(participant_id, application_data, corpus_data)
         
-        return True
+        # Index the resume once so later checks don't re-vectorize the corpus
+        try:
+            get_plagiarism_index().add(resume_fingerprint, owner=participant_id)
+        except Exception as e:
+            logger.error(f"Plagiarism index update error: {e}")
+        
+        # Make the new score visible on the next read instead of after the TTL
+        invalidate_dashboard_reads(participant_id)
+        
+        return upload_count
     except Exception as e:
         logger.error(f"Save error: {e}")
+        record_error('db.save_application')
+        if UPLOAD_LIMIT_ERROR in str(e):
+            raise Exception(f"{UPLOAD_LIMIT_ERROR}: maximum {MAX_UPLOADS} uploads per participant")
         st.error(f"Error saving application: {str(e)}")
-        return False
+        return None
 
-def get_resume_corpus():
-    """Fetch all resume texts for plagiarism detection"""
-    if not supabase:
-        return []
+def save_participant_application_rows(participant_id, application_data, corpus_data):
+    """Insert the application and corpus rows separately and return the new upload count"""
+    supabase = get_supabase_client()
+    
+    # Insert application
+    supabase.table('applications').insert(application_data).execute()
+    
+    # Save the resume fingerprint to the corpus for plagiarism detection
+    supabase.table('resume_corpus').insert({'participant_id': participant_id, **corpus_data}).execute()
     
+    return get_participant_upload_count(participant_id)
+
+def analyze_resume(resume_text, job_description, jd_education="", on_stage=None):
+    """
+    The CPU-bound part of scoring: parse the resume and compare it with the JD.
+    
+    Returns (parsed, jd_profile, keyword_similarity). Needs no database or
+    plagiarism index, so scoring jobs run it in worker processes.
+    """
+    if len(resume_text.strip()) < 100:
+        raise Exception("Resume text is too short")
+    validate_job_description(job_description)
+    
+    if on_stage:
+        on_stage('parse')
     try:
-        response = supabase.table('resume_corpus').select('resume_text').execute()
-        if response.data:
-            return [item['resume_text'] for item in response.data]
-        return []
+        parsed = parse_resume(resume_text)
     except Exception as e:
-        logger.error(f"Corpus fetch error: {e}")
-        return []
+        raise Exception(f"Resume parsing failed: {str(e)}")
+    
+    jd_profile = get_job_profile(job_description, jd_education)
+    keyword_score = calculate_keyword_similarity(resume_text, job_description, jd_profile.term_counts)
+    return parsed, jd_profile, keyword_score
 
+def finish_submission(participant_id, resume_text, parsed, jd_profile, keyword_similarity, on_stage=None):
+    """
+    Plagiarism check, final score and save for a parsed resume.
+    
+    Scoring jobs run it in the server process, which holds the shared
+    plagiarism index.
+    """
+    def report(stage):
+        if on_stage:
+            on_stage(stage)
+    
+    report('score')
+    plagiarism_score, plag_status = check_plagiarism(resume_text, participant_id=participant_id)
+    result = score_parsed_resume(resume_text, parsed, jd_profile, plagiarism_score, plag_status, keyword_similarity)
+    
+    report('save')
+    upload_count = save_participant_application(participant_id, resume_text, result)
+    if upload_count is None:
+        raise Exception("Failed to save application. Please try again.")
+    result['upload_count'] = upload_count
+    
+    report('done')
+    return result
+
+def validate_job_description(job_description):
+    if not job_description or len(job_description.strip()) < 50:
+        raise Exception("Job description is too short")
+
+# Set when the scoring queue is first created, so stats can be read without
+# starting its worker pool
+_scoring_queue_started = False
+
+# Background scoring: extraction and parsing run in worker processes, so the
+# script thread only enqueues the upload and then polls the job status.
+@st.cache_resource
+def get_scoring_queue():
+    global _scoring_queue_started
+    from jobs import ScoringQueue
+    queue = ScoringQueue()
+    _scoring_queue_started = True
+    return queue
+
+def enqueue_submission(participant_id, uploaded_file, job_description, jd_education=""):
+    """
+    Queue an uploaded resume for scoring and return the job ID.
+    
+    The file and JD are validated before anything is queued. Raises if
+    either is invalid or the queue is full.
+    """
+    is_valid, message = validate_pdf_file(uploaded_file)
+    if not is_valid:
+        raise Exception(message)
+    validate_job_description(job_description)
+    
+    uploaded_file.seek(0)
+    return get_scoring_queue().submit(participant_id, uploaded_file, job_description, jd_education)
+
+def get_submission_status(job_id):
+    """
+    {'stage', 'result', 'error'} for a queued submission, or None if the job is unknown.
+    
+    The stage is 'queued', 'extract', 'parse', 'score', 'save', then 'done'
+    with the result of finish_submission, or 'error' with a message.
+    """
+    return get_scoring_queue().status(job_id)
+
+def get_scoring_queue_stats():
+    """Workers and queued jobs; all zero until the first submission starts the queue"""
+    if not _scoring_queue_started:
+        return {'workers': 0, 'pending': 0, 'max_pending': 0}
+    return get_scoring_queue().stats()
+
+def to_bytea(data):
+    """bytea input literal for PostgREST"""
+    return '\\x' + data.hex()
+
+def iter_resume_corpus(batch_size=None):
+    """
+    Yield the plagiarism corpus in batches of up to `batch_size` documents.
+    
+    Each document is paired with the participant who submitted it, as
+    PlagiarismIndex expects. Fingerprinted rows come from the resume_fingerprints view as
+    Fingerprints, so the index never re-tokenizes them. Rows saved before
+    fingerprints existed are yielded as text. Pages are read by keyset on id
+    rather than with one unbounded select, so memory stays bounded and
+    PostgREST's row cap never truncates the corpus. Raises on a failed page,
+    so a rebuild never replaces the index with a partial corpus.
+    """
+    from plagiarism import decode_fingerprint
+    supabase = get_supabase_client()
+    if not supabase:
+        return
+    
+    batch_size = batch_size or CORPUS_PAGE_SIZE
+    
+    for rows in iter_pages(
+        lambda: supabase.table('resume_fingerprints').select('id, participant_id, term_vector, minhash'),
+        batch_size
+    ):
+        yield [
+            (row['participant_id'],
+             decode_fingerprint(base64.b64decode(row['term_vector']), base64.b64decode(row['minhash'])))
+            for row in rows
+        ]
+    
+    for rows in iter_pages(
+        lambda: supabase.table('resume_corpus').select('id, participant_id, resume_text').is_('term_vector', 'null'),
+        batch_size
+    ):
+        yield [(row['participant_id'], row['resume_text']) for row in rows]
+
+def iter_pages(build_query, batch_size):
+    """Yield pages of rows from `build_query()`, keyset-paginated on id"""
+    last_id = 0
+    while True:
+        with timed('db.corpus_page'):
+            response = build_query().gt('id', last_id).order('id').limit(batch_size).execute()
+        rows = response.data or []
+        record_size('corpus_page_rows', len(rows))
+        if not rows:
+            return
+        
+        last_id = rows[-1]['id']
+        yield rows
+        if len(rows) < batch_size:
+            return
+
+@timed('db.upload_count')
 def get_participant_upload_count(participant_id):
+    """Uploads used so far, read from the trigger-maintained participants.upload_count"""
+    supabase = get_supabase_client()
     if not supabase or not participant_id:
         return 0
     
     try:
-        response = supabase.table('applications').select('id').eq('participant_id', participant_id).execute()
-        return len(response.data) if response.data else 0
-    except Exception as e:
-        logger.error(f"Count error: {e}")
+        response = supabase.table('participants').select('upload_count').eq('id', participant_id).limit(1).execute()
+        if response.data:
+            return int(response.data[0]['upload_count'] or 0)
         return 0
+    except Exception as e:
+        logger.error(f"Upload count error: {e}")
+        record_error('db.upload_count')
+        # Fallback to a count-only query if the column isn't deployed
+        try:
+            response = supabase.table('applications').select('id', count='exact', head=True) \
+                .eq('participant_id', participant_id).execute()
+            return response.count or 0
+        except Exception as count_error:
+            logger.error(f"Count error: {count_error}")
+            return 0
 
-def get_participant_scores(participant_id):
-    if not supabase or not participant_id:
-        return pd.DataFrame()
+def invalidate_dashboard_reads(participant_id=None):
+    """Drop cached leaderboard and stats, and the participant's score history"""
+    get_leaderboard.invalidate()
+    get_competition_stats.invalidate()
+    if participant_id:
+        get_participant_scores.invalidate(participant_id)
+    else:
+        get_participant_scores.invalidate()
+
+def get_read_cache_stats():
+    return read_cache.stats()
+
+def get_metrics_text():
+    """Stage metrics and cache statistics in Prometheus text format"""
+    gauges = []
+    for row in read_cache.stats():
+        labels = {'function': row['function']}
+        for key in ('entries', 'hits', 'misses', 'coalesced', 'invalidations', 'errors'):
+            gauges.append((f"read_cache_{key}", labels, row[key]))
+    
+    for key, value in get_job_profile_cache_stats().items():
+        gauges.append((f"job_profile_cache_{key}", {}, value))
+    
+    document_cache = get_document_cache()
+    if document_cache:
+        try:
+            for key, value in document_cache.stats().items():
+                gauges.append((f"document_cache_{key}", {}, value))
+        except Exception as e:
+            logger.error(f"Document cache stats error: {e}")
     
+    for key, value in get_scoring_queue_stats().items():
+        gauges.append((f"scoring_queue_{key}", {}, value))
+    
+    return render_prometheus(gauges)
+
+# Serves get_metrics_text() at /metrics when ATS_METRICS and ATS_METRICS_PORT are set
+@st.cache_resource
+def start_metrics_server():
+    if not METRICS_ENABLED or not METRICS_PORT:
+        return None
     try:
-        response = supabase.table('applications').select('*').eq('participant_id', participant_id).order('created_at', desc=True).execute()
-        if response.data:
-            return pd.DataFrame(response.data)
-        return pd.DataFrame()
+        return start_http_server(METRICS_PORT, get_metrics_text)
     except Exception as e:
-        logger.error(f"Scores error: {e}")
+        logger.error(f"Metrics server failed to start: {e}")
+        return None
+
+def is_admin(email):
+    """True if `email` is listed in the ADMIN_EMAILS secret"""
+    if not email:
+        return False
+    
+    try:
+        admins = st.secrets.get("ADMIN_EMAILS", [])
+    except Exception:
+        return False
+    
+    if isinstance(admins, str):
+        admins = admins.split(",")
+    return email.strip().lower() in {admin.strip().lower() for admin in admins}
+
+# Cached reads raise on failure, so an error is never cached as an empty
+# result; the page gets the fallback and the next call retries the database.
+def empty_frame():
+    import pandas as pd
+    return pd.DataFrame()
+
+def require_supabase_client():
+    supabase = get_supabase_client()
+    if not supabase:
+        raise Exception("Database connection unavailable")
+    return supabase
+
+@cached_read(ttl=PARTICIPANT_SCORES_TTL, fallback=empty_frame)
+@timed('db.participant_scores')
+def get_participant_scores(participant_id):
+    import pandas as pd
+    if not participant_id:
         return pd.DataFrame()
+    supabase = require_supabase_client()
+    
+    response = supabase.table('applications').select('*').eq('participant_id', participant_id).order('created_at', desc=True).execute()
+    if response.data:
+        return pd.DataFrame(response.data)
+    return pd.DataFrame()
 
+LEADERBOARD_COLUMNS = ['rank', 'email', 'name', 'score', 'skills_count', 'experience', 'matched_skills_count']
+
+@cached_read(ttl=LEADERBOARD_TTL, fallback=empty_frame)
+@timed('db.leaderboard')
 def get_leaderboard():
     """Fetch leaderboard using the database view"""
-    if not supabase:
-        return pd.DataFrame()
+    import pandas as pd
+    supabase = require_supabase_client()
     
     try:
         # Use the leaderboard view created in schema
@@ -578,64 +1094,130 @@ def get_leaderboard():
         
     except Exception as e:
         logger.error(f"Leaderboard error: {e}")
-        # Fallback to manual query if view doesn't exist
+        record_error('db.leaderboard')
+        # Fallback to the participant_best table if the view doesn't exist
         try:
-            response = supabase.table('applications').select('participant_id, score, skills_count, experience_years, matched_skills_count').execute()
-            
-            if not response.data:
-                return pd.DataFrame()
-            
-            df = pd.DataFrame(response.data)
-            df = df.loc[df.groupby('participant_id')['score'].idxmax()]
-            df = df.sort_values('score', ascending=False).reset_index(drop=True)
-            df['rank'] = range(1, len(df) + 1)
-            
-            participants = supabase.table('participants').select('id, email, name').execute()
-            if participants.data:
-                participants_df = pd.DataFrame(participants.data)
-                df = df.merge(participants_df, left_on='participant_id', right_on='id', how='left')
-            
-            return df[['rank', 'email', 'name', 'score', 'skills_count', 'experience_years', 'matched_skills_count']].head(100)
-        except Exception as fallback_error:
-            logger.error(f"Fallback leaderboard error: {fallback_error}")
-            return pd.DataFrame()
+            return get_leaderboard_from_best()
+        except Exception as best_error:
+            logger.error(f"Participant best leaderboard error: {best_error}")
+            return get_leaderboard_from_applications()
+
+def get_leaderboard_from_best():
+    import pandas as pd
+    supabase = get_supabase_client()
+    
+    # Embed the participant through the foreign key so names come back in the same request
+    response = supabase.table('participant_best') \
+        .select('participant_id, best_score, skills_count, experience_years, matched_skills_count, participants(email, name)') \
+        .order('best_score', desc=True) \
+        .order('achieved_at') \
+        .limit(100) \
+        .execute()
+    
+    if not response.data:
+        return pd.DataFrame()
+    
+    rows = []
+    for row in response.data:
+        participant = row.pop('participants', None) or {}
+        rows.append({**row, 'email': participant.get('email'), 'name': participant.get('name')})
+    
+    df = pd.DataFrame(rows).rename(columns={'best_score': 'score', 'experience_years': 'experience'})
+    df['rank'] = range(1, len(df) + 1)
+    
+    return df[LEADERBOARD_COLUMNS]
+
+def get_leaderboard_from_applications():
+    import pandas as pd
+    supabase = get_supabase_client()
+    response = supabase.table('applications').select('participant_id, score, skills_count, experience_years, matched_skills_count').execute()
+    participants = supabase.table('participants').select('id, email, name').execute()
+    
+    if not response.data:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame(response.data)
+    df = df.loc[df.groupby('participant_id')['score'].idxmax()]
+    df = df.sort_values('score', ascending=False).reset_index(drop=True)
+    df['rank'] = range(1, len(df) + 1)
+    df = df.rename(columns={'experience_years': 'experience'})
+    
+    if participants.data:
+        participants_df = pd.DataFrame(participants.data)
+        df = df.merge(participants_df, left_on='participant_id', right_on='id', how='left')
+    
+    return df[LEADERBOARD_COLUMNS].head(100)
 
+@cached_read(ttl=STATS_TTL, fallback=lambda: None)
+@timed('db.competition_stats')
 def get_competition_stats():
-    if not supabase:
-        return None
+    """Competition statistics, aggregated server-side by the get_competition_stats() RPC"""
+    supabase = require_supabase_client()
     
     try:
-        apps = supabase.table('applications').select('score, experience_years, plagiarism_score, keyword_similarity').execute()
-        participants = supabase.table('participants').select('id').execute()
+        response = supabase.rpc('get_competition_stats').execute()
+        data = response.data
+        if isinstance(data, list):
+            data = data[0] if data else None
         
-        if not apps.data or not participants.data:
+        if not data or not data.get('total_submissions') or not data.get('total_participants'):
             return None
         
-        df = pd.DataFrame(apps.data)
-        
-        stats = {
-            'total_participants': len(participants.data),
-            'total_submissions': len(df),
-            'avg_score': float(df['score'].mean()),
-            'top_score': float(df['score'].max()),
-            'high_scorers': int(len(df[df['score'] >= 80])),
-            'avg_plagiarism': float(df['plagiarism_score'].mean()) if 'plagiarism_score' in df.columns else 0,
-            'avg_keyword_similarity': float(df['keyword_similarity'].mean()) if 'keyword_similarity' in df.columns else 0,
+        return {
+            'total_participants': int(data['total_participants']),
+            'total_submissions': int(data['total_submissions']),
+            'avg_score': float(data['avg_score']),
+            'top_score': float(data['top_score']),
+            'high_scorers': int(data['high_scorers']),
+            'avg_plagiarism': float(data['avg_plagiarism'] or 0),
+            'avg_keyword_similarity': float(data['avg_keyword_similarity'] or 0),
             'score_distribution': [
-                {'range': '0-40%', 'count': int(len(df[df['score'] < 40]))},
-                {'range': '40-60%', 'count': int(len(df[(df['score'] >= 40) & (df['score'] < 60)]))},
-                {'range': '60-80%', 'count': int(len(df[(df['score'] >= 60) & (df['score'] < 80)]))},
-                {'range': '80-100%', 'count': int(len(df[df['score'] >= 80]))}
+                {'range': bucket['range'], 'count': int(bucket['count'])}
+                for bucket in data['score_distribution']
             ],
             'experience_distribution': [
-                {'range': '0-2 years', 'count': int(len(df[df['experience_years'] <= 2]))},
-                {'range': '3-5 years', 'count': int(len(df[(df['experience_years'] >= 3) & (df['experience_years'] <= 5)]))},
-                {'range': '6-8 years', 'count': int(len(df[(df['experience_years'] >= 6) & (df['experience_years'] <= 8)]))},
-                {'range': '8+ years', 'count': int(len(df[df['experience_years'] > 8]))}
+                {'range': bucket['range'], 'count': int(bucket['count'])}
+                for bucket in data['experience_distribution']
             ]
         }
-        
-        return stats
     except Exception as e:
-        logger.error(f"Stats error: {e}")
+        logger.error(f"Stats RPC error: {e}")
+        record_error('db.competition_stats')
+        # Fallback to aggregating in pandas if the function isn't deployed
+        return get_competition_stats_from_rows()
+
+def get_competition_stats_from_rows():
+    import pandas as pd
+    supabase = get_supabase_client()
+    
+    apps = supabase.table('applications').select('score, experience_years, plagiarism_score, keyword_similarity').execute()
+    participants = supabase.table('participants').select('id').execute()
+    
+    if not apps.data or not participants.data:
         return None
+    
+    df = pd.DataFrame(apps.data)
+    
+    stats = {
+        'total_participants': len(participants.data),
+        'total_submissions': len(df),
+        'avg_score': float(df['score'].mean()),
+        'top_score': float(df['score'].max()),
+        'high_scorers': int(len(df[df['score'] >= 80])),
+        'avg_plagiarism': float(df['plagiarism_score'].mean()) if 'plagiarism_score' in df.columns else 0,
+        'avg_keyword_similarity': float(df['keyword_similarity'].mean()) if 'keyword_similarity' in df.columns else 0,
+        'score_distribution': [
+            {'range': '0-40%', 'count': int(len(df[df['score'] < 40]))},
+            {'range': '40-60%', 'count': int(len(df[(df['score'] >= 40) & (df['score'] < 60)]))},
+            {'range': '60-80%', 'count': int(len(df[(df['score'] >= 60) & (df['score'] < 80)]))},
+            {'range': '80-100%', 'count': int(len(df[df['score'] >= 80]))}
+        ],
+        'experience_distribution': [
+            {'range': '0-2 years', 'count': int(len(df[df['experience_years'] <= 2]))},
+            {'range': '3-5 years', 'count': int(len(df[(df['experience_years'] >= 3) & (df['experience_years'] <= 5)]))},
+            {'range': '6-8 years', 'count': int(len(df[(df['experience_years'] >= 6) & (df['experience_years'] <= 8)]))},
+            {'range': '8+ years', 'count': int(len(df[df['experience_years'] > 8]))}
+        ]
+    }
+    
+    return stats
@@ -0,0 +1,57 @@
+"""
+Cold-start time and memory of a worker importing backend.
+
+    python benchmarks/bench_cold_start.py --runs 5
+
+Each run imports backend in a fresh interpreter, as a new Streamlit worker
+does. `lazy` is the import alone; `eager` also calls get_nlp(), which is
+what importing backend used to do. Reports the median wall time and the
+median peak RSS of the process.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CHILD = """
+import json, logging, resource, sys, time
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+import backend
+if sys.argv[1] == "eager":
+    backend.get_nlp()
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+}))
+"""
+
+
+def measure(mode):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, mode],
+        cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["eager", "lazy"])
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'import s':>9} {'peak MB':>8}")
+    for mode in args.modes:
+        runs = [measure(mode) for _ in range(args.runs)]
+        seconds = statistics.median(run['seconds'] for run in runs)
+        rss = statistics.median(run['rss_mb'] for run in runs)
+        print(f"{mode:>6} {seconds:>9.2f} {rss:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Peak memory of building the plagiarism index from the stored corpus.
+
+    python benchmarks/bench_corpus_memory.py --sizes 10000 100000
+
+`unpaged` reproduces the old path: one response holding every resume, decoded
+into a list and passed to PlagiarismIndex.rebuild. `paged` reads keyset pages
+of --page-size resumes and feeds them to rebuild_batches. `fingerprints` reads
+pages of stored fingerprints (base64, as served by the resume_fingerprints
+view) instead of text; they are made before timing starts and stay resident,
+standing in for the database. Each run happens in a fresh subprocess; the
+reported figure is peak RSS above the RSS after setup, so it covers the
+corpus read and the index only.
+"""
+import argparse
+import base64
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_plagiarism import make_document, make_vocabulary  # noqa: E402
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def fetch_page(vocabulary, last_id, size, limit):
+    """A PostgREST response body for `limit` rows after `last_id`"""
+    rows = []
+    for doc_id in range(last_id + 1, min(last_id + limit, size) + 1):
+        rng = np.random.RandomState(doc_id)
+        rows.append({'id': doc_id, 'resume_text': make_document(rng, vocabulary)})
+    return json.dumps(rows)
+
+
+def make_fingerprint_pages(vocabulary, size, page_size):
+    """Pre-encoded fingerprint pages, as the database would store them"""
+    from plagiarism import encode_fingerprint, fingerprint_texts
+
+    pages = []
+    for first in range(1, size + 1, page_size):
+        ids = range(first, min(first + page_size, size + 1))
+        texts = [make_document(np.random.RandomState(doc_id), vocabulary) for doc_id in ids]
+        rows = []
+        for doc_id, fp in zip(ids, fingerprint_texts(texts)):
+            term_vector, minhash = encode_fingerprint(fp)
+            rows.append({
+                'id': doc_id,
+                'term_vector': base64.b64encode(term_vector).decode(),
+                'minhash': base64.b64encode(minhash).decode()
+            })
+        pages.append(json.dumps(rows))
+    return pages
+
+
+def iter_fingerprint_pages(pages):
+    from plagiarism import decode_fingerprint
+
+    for page in pages:
+        rows = json.loads(page)
+        yield [
+            decode_fingerprint(base64.b64decode(row['term_vector']), base64.b64decode(row['minhash']))
+            for row in rows
+        ]
+
+
+def iter_pages(vocabulary, size, page_size):
+    last_id = 0
+    while True:
+        rows = json.loads(fetch_page(vocabulary, last_id, size, page_size))
+        if not rows:
+            return
+        last_id = rows[-1]['id']
+        yield [row['resume_text'] for row in rows]
+        if len(rows) < page_size:
+            return
+
+
+def measure(mode, size, page_size):
+    from plagiarism import PlagiarismIndex
+
+    vocabulary = make_vocabulary(np.random.RandomState(0))
+    if mode == "fingerprints":
+        pages = make_fingerprint_pages(vocabulary, size, page_size)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+
+    index = PlagiarismIndex()
+    if mode == "unpaged":
+        rows = json.loads(fetch_page(vocabulary, 0, size, size))
+        index.rebuild([row['resume_text'] for row in rows])
+        del rows
+    elif mode == "fingerprints":
+        index.rebuild_batches(iter_fingerprint_pages(pages))
+    else:
+        index.rebuild_batches(iter_pages(vocabulary, size, page_size))
+
+    return {
+        'mode': mode,
+        'size': size,
+        'peak_mb': peak_rss_mb() - baseline,
+        'seconds': time.perf_counter() - start,
+        'indexed': index.size
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--modes", nargs="+", default=["unpaged", "paged", "fingerprints"])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], int(args.child[1]), args.page_size)))
+        return
+
+    print(f"{'mode':>12} {'resumes':>8} {'peak MB':>9} {'build s':>8}")
+    for size in args.sizes:
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, __file__, "--page-size", str(args.page_size), "--child", mode, str(size)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            row = json.loads(output.strip().splitlines()[-1])
+            print(f"{row['mode']:>12} {row['size']:>8} {row['peak_mb']:>9.0f} {row['seconds']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Import-time budget for backend, checked with `python -X importtime`.
+
+    python benchmarks/bench_import_time.py --budget-ms 250
+
+Imports backend in a fresh interpreter, prints the slowest modules and exits
+non-zero if the import takes longer than the budget or pulls in a module that
+should only be imported on the code path that needs it. Streamlit itself is
+imported first and not counted, since every page needs it.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Heavy modules that must not be imported by `import backend`
+LAZY_MODULES = ['pymupdf', 'fitz', 'spacy', 'sklearn', 'pandas', 'numpy', 'scipy', 'supabase', 'plagiarism']
+
+_line_pattern = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile():
+    """(module, self µs, cumulative µs, depth) for every module `import backend` loads"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import streamlit; import sys; sys.stderr.write('--\\n'); import backend"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    stderr = result.stderr.split("--\n", 1)[-1]
+    rows = []
+    for line in stderr.splitlines():
+        match = _line_pattern.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=250)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [sum(row[1] for row in profile) / 1000 for profile in profiles]
+    total_ms = statistics.median(totals)
+    profile = profiles[totals.index(total_ms)] if total_ms in totals else profiles[0]
+
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for module, self_us, cumulative_us, depth in sorted(profile, key=lambda row: -row[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {module}")
+
+    imported = {row[0] for row in profile}
+    eager = sorted(name for name in LAZY_MODULES if name in imported)
+
+    print(f"\nimport backend: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms, median of {args.runs})")
+    failed = False
+    if total_ms > args.budget_ms:
+        print("FAIL: over budget")
+        failed = True
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
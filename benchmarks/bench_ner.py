@@ -0,0 +1,95 @@
+"""
+Entity extraction throughput for single submissions and bulk re-scoring.
+
+    python benchmarks/bench_ner.py --docs 256 --n-process 1 2 4
+
+`single` runs one resume per extract_entities call, as a submission does, and
+reports the median latency. `batch` runs all resumes through one call with
+--batch-size, once per --n-process value, and reports resumes per second.
+With the real model, `full` repeats the batch run with every pipeline
+component enabled, for comparison with the NER-only pipeline.
+
+If the model is not installed, an untrained NER component with spaCy's
+default architecture stands in for it: its speed is representative, its
+entities are not. The document cache is not used, so every resume is
+processed.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_plagiarism import make_document, make_vocabulary  # noqa: E402
+from bench_submission import RESUME  # noqa: E402
+
+
+def stand_in_pipeline():
+    import spacy
+
+    nlp = spacy.blank("en")
+    ner = nlp.add_pipe("ner")
+    for label in ("ORG", "DATE", "PERSON", "GPE"):
+        ner.add_label(label)
+    nlp.initialize()
+    return nlp
+
+
+def make_resumes(count):
+    vocabulary = make_vocabulary(np.random.RandomState(0))
+    resumes = []
+    for n in range(count):
+        rng = np.random.RandomState(n)
+        resumes.append(RESUME.format(n=n, years=n % 9 + 1) + make_document(rng, vocabulary, length=500))
+    return resumes
+
+
+def main():
+    from ner import NER_MODEL, extract_entities, load_pipeline
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=256)
+    parser.add_argument("--single", type=int, default=50, help="resumes timed one at a time")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+
+    nlp = load_pipeline()
+    model = NER_MODEL
+    if nlp is None:
+        nlp = stand_in_pipeline()
+        model = "stand-in (untrained NER, default architecture)"
+    resumes = make_resumes(args.docs)
+    words = statistics.mean(len(text.split()) for text in resumes)
+    print(f"model: {model}; pipes: {', '.join(nlp.pipe_names)}; {words:.0f} words per resume\n")
+
+    extract_entities(resumes[:2], nlp)
+    latencies = []
+    for text in resumes[:args.single]:
+        start = time.perf_counter()
+        extract_entities([text], nlp)
+        latencies.append(time.perf_counter() - start)
+    print(f"{'single':>8}: {statistics.median(latencies) * 1000:.1f} ms per resume (median of {len(latencies)})")
+
+    for n_process in args.n_process:
+        start = time.perf_counter()
+        extract_entities(resumes, nlp, batch_size=args.batch_size, n_process=n_process)
+        rate = len(resumes) / (time.perf_counter() - start)
+        print(f"{'batch':>8}: {rate:.0f} resumes/s (batch_size={args.batch_size}, n_process={n_process})")
+
+    if model == NER_MODEL:
+        with nlp.select_pipes(enable=nlp.component_names):
+            start = time.perf_counter()
+            extract_entities(resumes, nlp, batch_size=args.batch_size)
+            rate = len(resumes) / (time.perf_counter() - start)
+        print(f"{'full':>8}: {rate:.0f} resumes/s with every component enabled")
+
+
+if __name__ == "__main__":
+    main()
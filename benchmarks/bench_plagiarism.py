@@ -0,0 +1,126 @@
+"""
+Compare the original refit-per-query plagiarism check with PlagiarismIndex.
+
+    python benchmarks/bench_plagiarism.py --sizes 1000 10000 100000
+
+Corpora are synthetic resumes drawn from a Zipf-distributed vocabulary; the
+query set mixes near-duplicates (20% of words replaced), partial copies (30-60%
+replaced, which land in the 40-60% and 60-80% penalty bands) and fresh
+documents. Band agreement is reported per penalty band of the full scan, so a
+LSH miss in the middle bands is not hidden by the easy cases.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from plagiarism import PlagiarismIndex  # noqa: E402
+
+
+def make_vocabulary(rng, size=20000):
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    return ["".join(rng.choice(letters, rng.randint(3, 10))) for _ in range(size)]
+
+
+def make_document(rng, vocabulary, length=450):
+    ranks = np.minimum(rng.zipf(1.3, length), len(vocabulary)) - 1
+    return " ".join(vocabulary[r] for r in ranks)
+
+
+def mutate(rng, vocabulary, text, rate=0.2):
+    words = text.split()
+    for i in rng.choice(len(words), int(len(words) * rate), replace=False):
+        words[i] = vocabulary[rng.randint(len(vocabulary))]
+    return " ".join(words)
+
+
+def legacy_check(resume_text, reference_corpus):
+    """The pre-index implementation of backend.check_plagiarism"""
+    corpus = [resume_text] + reference_corpus
+    vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=1000)
+    tfidf_matrix = vectorizer.fit_transform(corpus)
+    similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])
+    return float(np.max(similarities))
+
+
+def band(score):
+    return 3 if score > 0.8 else 2 if score > 0.6 else 1 if score > 0.4 else 0
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(size, queries, legacy_limit, seed):
+    rng = np.random.RandomState(seed)
+    vocabulary = make_vocabulary(rng)
+    corpus = [make_document(rng, vocabulary) for _ in range(size)]
+    sources = rng.choice(size, queries // 4 + queries // 2, replace=False)
+    duplicates = [mutate(rng, vocabulary, corpus[i]) for i in sources[:queries // 4]]
+    partial = [mutate(rng, vocabulary, corpus[i], rate=rng.uniform(0.3, 0.6)) for i in sources[queries // 4:]]
+    fresh = [make_document(rng, vocabulary) for _ in range(queries - len(duplicates) - len(partial))]
+    query_set = duplicates + partial + fresh
+
+    index = PlagiarismIndex()
+    _, build_time = timed(index.rebuild, corpus)
+
+    exhaustive, lsh = [], []
+    exhaustive_time = lsh_time = 0.0
+    for text in query_set:
+        score, elapsed = timed(index.query, text, exhaustive=True)
+        exhaustive.append(score)
+        exhaustive_time += elapsed
+        score, elapsed = timed(index.query, text, exhaustive=False)
+        lsh.append(score)
+        lsh_time += elapsed
+
+    row = {
+        'size': size,
+        'build_s': build_time,
+        'exhaustive_ms': exhaustive_time / len(query_set) * 1000,
+        'lsh_ms': lsh_time / len(query_set) * 1000,
+        'band_agreement': {
+            level: (sum(band(b) == level for a, b in zip(exhaustive, lsh) if band(a) == level),
+                    sum(band(a) == level for a in exhaustive))
+            for level in (1, 2, 3)
+        },
+        'legacy_ms': None,
+    }
+
+    if size <= legacy_limit:
+        legacy_time = sum(timed(legacy_check, text, corpus)[1] for text in query_set[:3])
+        row['legacy_ms'] = legacy_time / 3 * 1000
+
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--legacy-limit", type=int, default=100000,
+                        help="skip the refit-per-query baseline above this corpus size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'docs':>8} {'build s':>9} {'legacy ms':>10} {'full ms':>9} {'lsh ms':>8}"
+          f" {'lsh 40-60':>10} {'lsh 60-80':>10} {'lsh 80+':>10}")
+    for size in args.sizes:
+        row = run(size, args.queries, args.legacy_limit, args.seed)
+        legacy = f"{row['legacy_ms']:.1f}" if row['legacy_ms'] is not None else "skipped"
+        # Queries the LSH path puts in the same band as the full scan, out of those the full scan puts there
+        agreement = " ".join(f"{f'{same}/{total}':>10}" for same, total in row['band_agreement'].values())
+        print(f"{row['size']:>8} {row['build_s']:>9.2f} {legacy:>10} {row['exhaustive_ms']:>9.2f} "
+              f"{row['lsh_ms']:>8.2f} {agreement}")
+
+
+if __name__ == "__main__":
+    main()
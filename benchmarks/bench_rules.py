@@ -0,0 +1,152 @@
+"""
+Micro-benchmark of each rule-based extractor against the code it replaced.
+
+    python benchmarks/bench_rules.py --docs 200 --filler 600
+
+Each resume is the benchmark template with --filler words of generated
+prose in the experience section. For every extractor, prints the mean time
+per resume of the legacy code (as it was inline in backend.py and
+job_profiles.py) and of rules.py / sections.py, and counts resumes where
+the two disagree. The legacy section scan runs once per section in
+SECTION_HEADINGS, since segment_sections returns all of them; sections are
+not compared, as the segmenter's rules differ.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_plagiarism import make_document, make_vocabulary  # noqa: E402
+from bench_submission import JOB_DESCRIPTION, RESUME  # noqa: E402
+
+import rules  # noqa: E402
+from sections import SECTION_HEADINGS, segment_sections  # noqa: E402
+
+PHRASES = [
+    "I have {n} years of experience in Python.",
+    "Experience: {n} years",
+    "Spent {n}+ years in data engineering.",
+    "Worked for {n} years at a startup.",
+    "GPA: 3.{n}/4",
+]
+
+
+def legacy_experience_years(text):
+    patterns = [
+        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
+        r'experience[:\s]+(\d+)\+?\s*years?',
+        r'(\d+)\+?\s*years?\s+in\s+',
+        r'worked\s+for\s+(\d+)\+?\s*years?'
+    ]
+    text_lower = text.lower()
+    years = 0
+    for pattern in patterns:
+        values = [int(m) for m in re.findall(pattern, text_lower) if int(m) <= 50]
+        if values:
+            years = max(years, max(values))
+    return years
+
+
+def legacy_required_experience(job_description):
+    match = re.search(r'(\d+)\+?\s*years?', job_description.lower())
+    years = int(match.group(1)) if match else 2
+    return years or 1
+
+
+def legacy_extract_section(text, keywords):
+    lines = text.split('\n')
+    section_text = ""
+    capturing = False
+    for line in lines:
+        line_lower = line.lower().strip()
+        if any(kw in line_lower for kw in keywords):
+            capturing = True
+            continue
+        if capturing and line_lower and line.strip().isupper() and len(line.strip()) < 50:
+            break
+        if capturing:
+            section_text += line + "\n"
+    return section_text.strip()
+
+
+def legacy_education(section):
+    edu_lower = section.lower()
+    terms = {t for t in rules.EDUCATION_DEGREES + rules.EDUCATION_FIELDS if t in edu_lower}
+    cgpa = re.findall(r'(?:cgpa|gpa|grade)[:\s]*(\d+\.?\d*)\s*(?:/\s*(\d+\.?\d*))?', edu_lower)
+    return terms, [(float(v), float(s) if s else 10.0) for v, s in cgpa]
+
+
+def new_education(text, span):
+    return rules.education_terms(text, *span), rules.cgpa_claims(text, *span)
+
+
+def make_resumes(count, filler):
+    vocabulary = make_vocabulary(np.random.RandomState(0))
+    resumes = []
+    for n in range(count):
+        rng = np.random.RandomState(n)
+        phrase = PHRASES[n % len(PHRASES)].format(n=n % 12 + 1)
+        body = make_document(rng, vocabulary, length=filler)
+        resumes.append(RESUME.format(n=n % 10, years=n % 9 + 1).replace(
+            "PROJECTS", f"{phrase}\n{body}\nPROJECTS"
+        ))
+    return resumes
+
+
+def timed(fn, items):
+    start = time.perf_counter()
+    results = [fn(item) for item in items]
+    return (time.perf_counter() - start) / len(items) * 1e6, results
+
+
+def compare(name, legacy, new, items, check=True):
+    legacy_us, legacy_results = timed(legacy, items)
+    new_us, new_results = timed(new, items)
+    differ = sum(a != b for a, b in zip(legacy_results, new_results)) if check else "-"
+    print(f"{name:>20} {legacy_us:>10.1f} {new_us:>10.1f} {legacy_us / new_us:>8.1f}x {differ:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--filler", type=int, default=600, help="generated words per resume")
+    args = parser.parse_args()
+
+    resumes = make_resumes(args.docs, args.filler)
+    spans = [segment_sections(text) for text in resumes]
+    print(f"{args.docs} resumes, {np.mean([len(t) for t in resumes]):.0f} chars each\n")
+    print(f"{'extractor':>20} {'legacy µs':>10} {'rules µs':>10} {'speedup':>9} {'differ':>7}")
+
+    compare("experience years", legacy_experience_years, rules.stated_experience_years, resumes)
+    compare(
+        "required experience", legacy_required_experience, rules.required_experience_years,
+        [JOB_DESCRIPTION.replace("3+", str(n % 7)) for n in range(args.docs)]
+    )
+    compare(
+        "sections",
+        lambda text: [legacy_extract_section(text, keywords) for keywords in SECTION_HEADINGS.values()],
+        segment_sections, resumes, check=False
+    )
+    compare(
+        "education + cgpa",
+        lambda item: legacy_education(legacy_extract_section(item[0], ['education', 'academic', 'qualification'])),
+        lambda item: new_education(item[0], item[1].get('education', (0, 0))),
+        [(text, sections) for text, sections in zip(resumes, spans)]
+    )
+
+    items = [(text, sections.get('experience', (0, 0))) for text, sections in zip(resumes, spans)]
+    us, results = timed(lambda item: rules.months_covered(
+        [(first, last) for first, last, _, _ in rules.date_ranges(item[0], *item[1])]
+    ), items)
+    print(f"{'employment ranges':>20} {'-':>10} {us:>10.1f} {'':>9} {'':>7}  ({results[0]} months for the first resume)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Submissions per second through the submission pipeline under concurrent load.
+
+    python benchmarks/bench_submission.py --threads 1 4 16 --submissions 64
+
+Each worker thread stands in for a Streamlit script thread and runs PDF
+extraction and scoring for a unique generated resume. `--legacy-delays`
+adds back the time.sleep calls the submit handler used to make (3.2 s per
+submission) for a before/after comparison. The database save is skipped so
+the numbers reflect the app server only.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymupdf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+LEGACY_DELAYS = {'extract': 0.4, 'parse': 0.6, 'save': 0.4, 'done': 0.3 + 1.5}
+
+RESUME = """Jane Doe
+SKILLS
+Python, Django, Flask, JavaScript, AWS, Docker, SQL, PostgreSQL, Git, React
+EXPERIENCE
+Software Engineer at Example Corp, Jan 2019 - Mar 2022
+I have {years} years of experience building web services in Python and Django.
+PROJECTS
+Built a Django REST API deployed on AWS with Docker and PostgreSQL (build {n}).
+Created a React dashboard using JavaScript.
+EDUCATION
+B.Tech in Computer Science, 2015 - 2019
+CGPA: 8.{n}/10
+"""
+
+JOB_DESCRIPTION = (
+    "We are hiring a Python developer with 3+ years of experience in Django, "
+    "AWS, Docker and SQL. A bachelor's degree in computer science is preferred."
+)
+
+
+class FakeUpload(io.BytesIO):
+    type = "application/pdf"
+
+    @property
+    def size(self):
+        return len(self.getvalue())
+
+
+def make_pdf(n):
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_textbox(pymupdf.Rect(40, 40, 560, 800), RESUME.format(n=n, years=n % 9 + 1), fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def submit(pdf_bytes, legacy_delays):
+    import backend
+
+    def pause(stage):
+        if legacy_delays:
+            time.sleep(LEGACY_DELAYS.get(stage, 0))
+
+    pause('extract')
+    text = backend.extract_pdf_text(FakeUpload(pdf_bytes))
+    result = backend.calculate_ats_score(text, JOB_DESCRIPTION, on_stage=pause)
+    pause('save')
+    pause('done')
+    return result['score']
+
+
+def run(threads, pdfs, legacy_delays):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda pdf: submit(pdf, legacy_delays), pdfs))
+    elapsed = time.perf_counter() - start
+    return len(pdfs) / elapsed, elapsed / len(pdfs) * threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--submissions", type=int, default=64)
+    parser.add_argument("--legacy-delays", action="store_true", help="also run with the old sleeps")
+    args = parser.parse_args()
+
+    # Unique PDFs so the document cache does not turn the run into cache hits
+    offset = int(time.time())
+    modes = [False, True] if args.legacy_delays else [False]
+
+    submit(make_pdf(offset), False)  # warm up model and taxonomy loading
+
+    print(f"{'mode':>8} {'threads':>8} {'subs/s':>8} {'latency s':>10}")
+    for legacy in modes:
+        for threads in args.threads:
+            offset += args.submissions
+            pdfs = [make_pdf(offset + i) for i in range(args.submissions)]
+            throughput, latency = run(threads, pdfs, legacy)
+            mode = "sleeps" if legacy else "current"
+            print(f"{mode:>8} {threads:>8} {throughput:>8.1f} {latency:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Bulk re-scoring of a directory or zip archive of resume PDFs.
+
+    python bulk.py resumes.zip --jd job_description.txt -o results.csv
+
+Extraction and scoring run in a process pool; each file is scored
+independently, so one unreadable PDF only produces an error row. Every worker
+loads its own NER pipeline, so parallelism comes from the pool rather than
+from spaCy's n_process.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = [
+    'file', 'score', 'matched_skills_count', 'skills_count', 'matched_skills',
+    'experience_years', 'keyword_similarity', 'resume_quality_score', 'penalties', 'error'
+]
+
+# Set in each worker by _init_worker so the JD is preprocessed once per process
+_worker_jd = None
+
+
+def iter_pdf_files(source):
+    """Yield (name, pdf_bytes) for every PDF in a directory tree or zip archive"""
+    from backend import MAX_PDF_SIZE
+
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for filename in sorted(files):
+                if not filename.lower().endswith(".pdf"):
+                    continue
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, source)
+                if os.path.getsize(path) > MAX_PDF_SIZE:
+                    yield name, None
+                    continue
+                with open(path, "rb") as f:
+                    yield name, f.read()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                    continue
+                if info.file_size > MAX_PDF_SIZE:
+                    yield info.filename, None
+                    continue
+                yield info.filename, archive.read(info)
+    else:
+        raise Exception(f"{source} is neither a directory nor a zip archive")
+
+
+def count_pdf_files(source):
+    if os.path.isdir(source):
+        return sum(
+            1 for _, _, files in os.walk(source)
+            for filename in files if filename.lower().endswith(".pdf")
+        )
+    with zipfile.ZipFile(source) as archive:
+        return sum(
+            1 for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(".pdf")
+        )
+
+
+def _init_worker(job_description, jd_education):
+    global _worker_jd
+    from backend import get_job_profile
+
+    logging.basicConfig(level=logging.ERROR)
+    _worker_jd = (job_description, get_job_profile(job_description, jd_education))
+
+
+def _score_file(name, pdf_bytes):
+    """Score one file in a worker; returns its result row and the worker's metrics"""
+    from backend import (
+        calculate_keyword_similarity,
+        extract_pdf_bytes,
+        parse_resume,
+        score_parsed_resume,
+    )
+
+    try:
+        if pdf_bytes is None:
+            raise Exception("File size exceeds 20MB limit")
+
+        job_description, jd_profile = _worker_jd
+        text = extract_pdf_bytes(pdf_bytes)
+        if len(text.strip()) < 100:
+            raise Exception("Resume text is too short")
+
+        parsed = parse_resume(text)
+        keyword_similarity = calculate_keyword_similarity(text, job_description, jd_profile.term_counts)
+        # Archives are re-scored against themselves, so plagiarism is not checked here
+        result = score_parsed_resume(text, parsed, jd_profile, 0, "Not checked", keyword_similarity)
+
+        row = {
+            'file': name,
+            'score': result['score'],
+            'matched_skills_count': result['matched_skills_count'],
+            'skills_count': len(result['skills']),
+            'matched_skills': result['matched_skills'],
+            'experience_years': result['experience_years'],
+            'keyword_similarity': result['keyword_similarity'],
+            'resume_quality_score': result['resume_quality_score'],
+            'penalties': result['penalties'],
+            'error': None
+        }
+    except Exception as e:
+        row = {'file': name, 'error': str(e)}
+    return row, metrics.drain()
+
+
+def iter_score_archive(source, job_description, jd_education="", max_workers=None,
+                       max_in_flight=None, progress=None):
+    """
+    Score every PDF in `source` and yield one result dict per file as it completes.
+
+    At most `max_in_flight` files (default: two per worker) are read and queued
+    at a time, so memory stays bounded regardless of archive size.
+    `progress(done, total, row)` is called after every file.
+    """
+    if not job_description or len(job_description.strip()) < 50:
+        raise Exception("Job description is too short")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or max_workers * 2
+    total = count_pdf_files(source)
+    files = iter_pdf_files(source)
+    context = multiprocessing.get_context("spawn")
+
+    def new_pool():
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(job_description, jd_education)
+        )
+
+    done = 0
+    pool = new_pool()
+    in_flight = {}
+    exhausted = False
+
+    try:
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < max_in_flight:
+                try:
+                    name, pdf_bytes = next(files)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight[pool.submit(_score_file, name, pdf_bytes)] = name
+
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in finished:
+                name = in_flight.pop(future)
+                try:
+                    row, worker_metrics = future.result()
+                    metrics.merge(worker_metrics)
+                except BrokenProcessPool:
+                    broken = True
+                    row = {'file': name, 'error': "Worker crashed while processing file"}
+                except Exception as e:
+                    row = {'file': name, 'error': str(e)}
+
+                done += 1
+                if progress:
+                    progress(done, total, row)
+                yield row
+
+            if broken:
+                # A crashing PDF takes the pool down with it; fail the files that
+                # were queued alongside it and continue on a fresh pool
+                for future, name in in_flight.items():
+                    done += 1
+                    row = {'file': name, 'error': "Worker crashed while processing file"}
+                    if progress:
+                        progress(done, total, row)
+                    yield row
+                in_flight = {}
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = new_pool()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def score_pdf_archive(source, job_description, jd_education="", max_workers=None, progress=None):
+    """Score every PDF in a directory or zip archive and return a DataFrame sorted by score"""
+    rows = list(iter_score_archive(
+        source, job_description, jd_education, max_workers=max_workers, progress=progress
+    ))
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return df.sort_values('score', ascending=False, na_position='last').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-score a directory or zip archive of resume PDFs")
+    parser.add_argument("source", help="directory or .zip containing PDFs")
+    parser.add_argument("--jd", required=True, help="file containing the job description")
+    parser.add_argument("--jd-education", default="", help="education requirement text")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("-o", "--output", default="bulk_scores.csv", help="CSV file to write")
+    args = parser.parse_args()
+
+    with open(args.jd, encoding="utf-8") as f:
+        job_description = f.read()
+
+    def report(done, total, row):
+        status = "error" if row.get('error') else f"{row['score']:.1f}"
+        print(f"[{done}/{total}] {row['file']}: {status}", file=sys.stderr)
+
+    df = score_pdf_archive(args.source, job_description, args.jd_education, args.workers, report)
+    df.to_csv(args.output, index=False)
+    print(f"Scored {df['error'].isna().sum()}/{len(df)} files -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Memory-bounded PDF ingestion.
+
+An upload is copied in chunks to an anonymous temp file and hashed on the
+way. It is rejected as soon as it grows past the size limit or its first
+bytes are not a PDF header. PyMuPDF reads the document through a memory map
+of that file, so it is never held as another bytes object. Text comes out one
+page at a time under page-count and text-size caps. A scanned (image-only)
+document is recognised from its first pages, before the rest is extracted.
+"""
+import hashlib
+import logging
+import mmap
+import tempfile
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+PDF_HEADER = b"%PDF-"
+# Readers accept junk before the header as long as it starts in the first 1KB
+HEADER_SEARCH_BYTES = 1024
+
+MAX_PAGES = 20
+MAX_TEXT_CHARS = 200_000
+
+# A document whose first pages have images but less text than this is treated as scanned
+SCAN_CHECK_PAGES = 2
+MIN_TEXT_CHARS = 20
+
+
+class SpooledPDF:
+    """An uploaded PDF copied to a temp file, with its SHA-256 and size"""
+
+    def __init__(self, file, sha256, size):
+        self.file = file
+        self.sha256 = sha256
+        self.size = size
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def spool_pdf(stream, max_size, chunk_size=CHUNK_SIZE):
+    """Copy a file object to a temp file, rejecting it early if it is too big or not a PDF"""
+    spool = tempfile.TemporaryFile()
+    digest = hashlib.sha256()
+    try:
+        chunk = stream.read(HEADER_SEARCH_BYTES)
+        if not chunk:
+            raise Exception("File is empty")
+        if PDF_HEADER not in chunk:
+            raise Exception("File is not a valid PDF")
+
+        size = 0
+        while chunk:
+            size += len(chunk)
+            if size > max_size:
+                raise Exception(f"File size exceeds {max_size // (1024 * 1024)}MB limit")
+            digest.update(chunk)
+            spool.write(chunk)
+            chunk = stream.read(chunk_size)
+        spool.flush()
+    except Exception:
+        spool.close()
+        raise
+    return SpooledPDF(spool, digest.hexdigest(), size)
+
+
+@contextmanager
+def open_pdf(spooled):
+    """Open a spooled PDF with PyMuPDF through a read-only memory map"""
+    import pymupdf
+
+    mapped = mmap.mmap(spooled.file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    doc = None
+    try:
+        try:
+            doc = pymupdf.open(stream=view, filetype="pdf")
+        except Exception as e:
+            raise Exception(f"Could not open PDF: {e}")
+        if doc.needs_pass:
+            raise Exception("PDF is password protected")
+        yield doc
+    finally:
+        if doc is not None:
+            doc.close()
+        # PyMuPDF keeps a reference to the buffer until the document is gone
+        doc = None
+        view.release()
+        mapped.close()
+
+
+def iter_page_text(doc, max_pages=MAX_PAGES, max_chars=MAX_TEXT_CHARS):
+    """
+    Yield the text of each page of an open document.
+
+    Raises before extracting anything if the document has more than
+    `max_pages` pages, after the first pages if they look scanned, and as
+    soon as the text so far exceeds `max_chars`.
+    """
+    if doc.page_count > max_pages:
+        raise Exception(f"PDF has {doc.page_count} pages; the limit is {max_pages}")
+
+    check_pages = min(SCAN_CHECK_PAGES, doc.page_count)
+    pending = []
+    has_images = False
+    total = 0
+
+    for number, page in enumerate(doc):
+        text = page.get_text() + "\n"
+        total += len(text)
+        if total > max_chars:
+            raise Exception(f"PDF text exceeds {max_chars} characters")
+
+        if number >= check_pages:
+            yield text
+            continue
+
+        pending.append(text)
+        has_images = has_images or bool(page.get_images())
+        if number == check_pages - 1:
+            if has_images and sum(len(t.strip()) for t in pending) < MIN_TEXT_CHARS:
+                raise Exception("PDF appears to be a scanned image; please upload a PDF with selectable text")
+            yield from pending
+            pending = []
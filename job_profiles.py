@@ -0,0 +1,156 @@
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+from rules import EDUCATION_DEGREES, EDUCATION_FIELDS, required_experience_years
+
+# Size of the vocabulary used for resume/JD keyword similarity
+KEYWORD_MAX_FEATURES = 100
+
+_whitespace_pattern = re.compile(r'\s+')
+_analyzer = None
+
+
+def analyze(text):
+    """Terms of `text` as seen by TfidfVectorizer(stop_words='english')"""
+    global _analyzer
+    if _analyzer is None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        _analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+    return _analyzer(text)
+
+
+def term_counts(text):
+    return Counter(analyze(text))
+
+
+def keyword_similarity(resume_counts, jd_counts, max_features=KEYWORD_MAX_FEATURES):
+    """
+    Cosine similarity (0-1) of two documents' TF-IDF vectors.
+
+    Same result as fitting TfidfVectorizer(max_features=...) on just the two
+    documents, including which of the terms tied at the max_features cut are
+    kept, but works from precomputed term counts so the JD side can be reused
+    across resumes.
+    """
+    totals = Counter(resume_counts)
+    totals.update(jd_counts)
+    if not totals:
+        return 0.0
+
+    vocabulary = sorted(totals)
+    if len(vocabulary) > max_features:
+        import numpy as np
+        # The same cut sklearn makes: its (unstable) argsort of negated total
+        # frequencies over the alphabetical vocabulary, so ties at the limit
+        # fall the same way
+        frequencies = np.array([totals[term] for term in vocabulary], dtype=np.int64)
+        vocabulary = [vocabulary[i] for i in (-frequencies).argsort()[:max_features]]
+
+    weighted = []
+    for counts in (resume_counts, jd_counts):
+        vector = {}
+        for term in vocabulary:
+            count = counts.get(term, 0)
+            if count:
+                doc_freq = (term in resume_counts) + (term in jd_counts)
+                vector[term] = count * (math.log(3 / (1 + doc_freq)) + 1)
+        weighted.append(vector)
+
+    resume_vector, jd_vector = weighted
+    resume_norm = math.sqrt(sum(value * value for value in resume_vector.values()))
+    jd_norm = math.sqrt(sum(value * value for value in jd_vector.values()))
+    if not resume_norm or not jd_norm:
+        return 0.0
+
+    dot = sum(value * jd_vector.get(term, 0) for term, value in resume_vector.items())
+    return dot / (resume_norm * jd_norm)
+
+
+@dataclass(frozen=True)
+class JobProfile:
+    """Everything scoring needs from a job description, computed once per JD"""
+    fingerprint: str
+    skills: frozenset
+    required_experience: int
+    degrees: tuple
+    fields: tuple
+    has_education: bool
+    term_counts: dict
+
+
+def fingerprint(job_description, jd_education, vocabulary_fingerprint=""):
+    """Key for a JD that ignores whitespace-only differences between pastes"""
+    normalized = "\0".join([
+        _whitespace_pattern.sub(" ", job_description or "").strip(),
+        _whitespace_pattern.sub(" ", jd_education or "").strip().lower(),
+        vocabulary_fingerprint
+    ])
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def build_job_profile(job_description, jd_education, skill_matcher, key=None):
+    jd_education_lower = jd_education.lower() if jd_education else ""
+
+    return JobProfile(
+        fingerprint=key or fingerprint(job_description, jd_education, skill_matcher.fingerprint),
+        skills=frozenset(skill_matcher.scan(job_description)['skills']),
+        required_experience=required_experience_years(job_description),
+        degrees=tuple(d for d in EDUCATION_DEGREES if d in jd_education_lower),
+        fields=tuple(f for f in EDUCATION_FIELDS if f in jd_education_lower),
+        has_education=bool(jd_education_lower),
+        term_counts=dict(term_counts(job_description))
+    )
+
+
+class JobProfileCache:
+    """Thread-safe LRU of JobProfiles keyed by JD fingerprint, with hit/miss counters"""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, job_description, jd_education, skill_matcher):
+        key = fingerprint(job_description, jd_education, skill_matcher.fingerprint)
+
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        profile = build_job_profile(job_description, jd_education, skill_matcher, key)
+
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+                self.evictions += 1
+
+        return profile
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._profiles),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
@@ -0,0 +1,274 @@
+"""
+Background scoring jobs for resume submissions.
+
+A submission is queued under a job ID and the Streamlit script thread only
+polls its status. The CPU-bound stages (PDF extraction, parsing and keyword
+similarity) run in a bounded pool of worker processes. The plagiarism check,
+final score and database save run on a small thread pool in the server
+process, which owns the shared plagiarism index and read cache.
+
+Job status lives in SQLite, so worker processes can report the stage they
+are in and the status survives Streamlit reruns.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+JOBS_PATH = os.environ.get(
+    "ATS_JOBS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ats_jobs.sqlite3")
+)
+
+# Worker processes for the CPU-bound stages; one core is left for the server
+SCORING_WORKERS = int(os.environ.get("ATS_SCORING_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+# Queued plus running jobs per worker; beyond this, submissions are refused
+# instead of piling up uploaded files on disk
+MAX_PENDING_PER_WORKER = 4
+
+# Threads that finish jobs in the server process; mostly waiting on the database
+FINISH_THREADS = 4
+
+# Finished jobs are kept this long so a reconnecting session can read its result
+JOB_RETENTION = 24 * 60 * 60
+
+QUEUE_FULL_ERROR = "Scoring queue is full. Please try again in a minute."
+
+STAGE_DONE = 'done'
+STAGE_ERROR = 'error'
+
+
+class JobStore:
+    """Job status rows in SQLite, shared by the server and its worker processes"""
+
+    def __init__(self, path=JOBS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " participant_id TEXT,"
+            " stage TEXT NOT NULL,"
+            " result TEXT,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def create(self, job_id, participant_id):
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, participant_id, stage, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?)",
+            (job_id, participant_id, now, now)
+        )
+
+    def set_stage(self, job_id, stage):
+        self._execute("UPDATE jobs SET stage = ?, updated_at = ? WHERE id = ?", (stage, time.time(), job_id))
+
+    def finish(self, job_id, result):
+        self._execute(
+            "UPDATE jobs SET stage = ?, result = ?, updated_at = ? WHERE id = ?",
+            (STAGE_DONE, json.dumps(result, default=str), time.time(), job_id)
+        )
+
+    def fail(self, job_id, error):
+        self._execute(
+            "UPDATE jobs SET stage = ?, error = ?, updated_at = ? WHERE id = ?",
+            (STAGE_ERROR, error, time.time(), job_id)
+        )
+
+    def get(self, job_id):
+        """{'id', 'stage', 'result', 'error'} for a job, or None if it is unknown"""
+        row = self._execute("SELECT id, stage, result, error FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'stage': row[1],
+            'result': json.loads(row[2]) if row[2] else None,
+            'error': row[3]
+        }
+
+    def abandon_unfinished(self, error="Scoring was interrupted by a server restart. Please submit again."):
+        """Fail jobs left queued or running by a previous server process"""
+        self._execute(
+            "UPDATE jobs SET stage = ?, error = ?, updated_at = ? WHERE stage NOT IN (?, ?)",
+            (STAGE_ERROR, error, time.time(), STAGE_DONE, STAGE_ERROR)
+        )
+
+    def purge(self, max_age=JOB_RETENTION):
+        self._execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - max_age,))
+
+
+# Set in each worker process by _init_worker
+_worker_store = None
+
+
+def _init_worker(store_path):
+    global _worker_store
+    logging.basicConfig(level=logging.ERROR)
+    _worker_store = JobStore(store_path)
+
+
+def _analyze(job_id, pdf_path, job_description, jd_education, queued_at):
+    """
+    Worker process: extract the resume text and run the CPU-bound scoring stages.
+
+    Returns the stage results and the metrics this worker recorded since its
+    last result; those of a failed job go back with the worker's next one.
+    """
+    from backend import analyze_resume, extract_pdf_stream
+
+    metrics.record_latency('job.queue_wait', time.time() - queued_at)
+    _worker_store.set_stage(job_id, 'extract')
+    try:
+        with open(pdf_path, "rb") as f:
+            text = extract_pdf_stream(f)
+    except Exception as e:
+        raise Exception(f"PDF extraction error: {str(e)}")
+
+    parsed, jd_profile, keyword_similarity = analyze_resume(
+        text, job_description, jd_education,
+        on_stage=lambda stage: _worker_store.set_stage(job_id, stage)
+    )
+    return (text, parsed, jd_profile, keyword_similarity), metrics.drain()
+
+
+class ScoringQueue:
+    """
+    Runs submissions in the background with bounded concurrency.
+
+    At most `workers` submissions use the CPU at once, and at most
+    `max_pending` are queued or running; submit() raises once the queue is
+    full. Uploaded files are copied to a private temp directory until their
+    job finishes.
+    """
+
+    def __init__(self, store_path=JOBS_PATH, workers=SCORING_WORKERS, max_pending=None):
+        self.workers = workers
+        self.max_pending = max_pending or workers * MAX_PENDING_PER_WORKER
+        self.store = JobStore(store_path)
+        self.store.abandon_unfinished()
+        self.store.purge()
+
+        self._store_path = store_path
+        self._context = multiprocessing.get_context("spawn")
+        self._pool = self._new_pool()
+        self._finisher = ThreadPoolExecutor(max_workers=FINISH_THREADS, thread_name_prefix="scoring-finish")
+        self._upload_dir = tempfile.mkdtemp(prefix="ats-jobs-")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._store_path,)
+        )
+
+    def submit(self, participant_id, stream, job_description, jd_education=""):
+        """Queue a PDF file object for scoring and return the job ID"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                metrics.record_error('job.queue_full')
+                raise Exception(QUEUE_FULL_ERROR)
+            self._pending += 1
+
+        queued_at = time.perf_counter()
+        job_id = str(uuid.uuid4())
+        pdf_path = os.path.join(self._upload_dir, f"{job_id}.pdf")
+        try:
+            with open(pdf_path, "wb") as f:
+                shutil.copyfileobj(stream, f)
+            self.store.create(job_id, participant_id)
+            with self._lock:
+                pool = self._pool
+            future = pool.submit(_analyze, job_id, pdf_path, job_description, jd_education, time.time())
+        except Exception:
+            self._release(pdf_path)
+            raise
+
+        future.add_done_callback(
+            lambda done: self._finisher.submit(self._finish, job_id, participant_id, pdf_path, pool, done, queued_at)
+        )
+        return job_id
+
+    def status(self, job_id):
+        return self.store.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+        return {'workers': self.workers, 'pending': pending, 'max_pending': self.max_pending}
+
+    def _finish(self, job_id, participant_id, pdf_path, pool, future, queued_at):
+        from backend import finish_submission
+
+        try:
+            try:
+                analysis, worker_metrics = future.result()
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+                raise Exception("Scoring worker crashed while processing the file")
+            metrics.merge(worker_metrics)
+            text, parsed, jd_profile, keyword_similarity = analysis
+
+            result = finish_submission(
+                participant_id, text, parsed, jd_profile, keyword_similarity,
+                on_stage=lambda stage: self.store.set_stage(job_id, stage)
+            )
+            self.store.finish(job_id, result)
+        except Exception as e:
+            logger.error(f"Scoring job {job_id} failed: {e}")
+            metrics.record_error('job')
+            self.store.fail(job_id, str(e))
+        finally:
+            metrics.record_latency('job', time.perf_counter() - queued_at)
+            self._release(pdf_path)
+
+    def _replace_pool(self, broken):
+        # A crashing PDF takes the whole pool down; the jobs queued alongside it
+        # fail too, and later submissions go to a fresh pool
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = self._new_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, pdf_path):
+        try:
+            os.remove(pdf_path)
+        except OSError:
+            pass
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._finisher.shutdown(wait=True)
+        shutil.rmtree(self._upload_dir, ignore_errors=True)
@@ -0,0 +1,268 @@
+"""
+Per-stage latency, error and payload-size metrics in Prometheus text format.
+
+Metrics are off unless ATS_METRICS is set (to 1, true, yes or on) when the
+process starts. While off, `timed` returns the decorated function unchanged
+and the record_* helpers return at once, so instrumented code pays nothing.
+
+    @timed('parse_resume')
+    def parse_resume(text): ...
+
+    with timed('db.submit_application'):
+        ...
+
+    record_size('pdf_bytes', size)
+
+Worker processes keep their own registry; they hand what they recorded back
+with their results via drain(), and the server merges it. render_prometheus()
+returns the exposition text, which the Admin page shows and, with
+ATS_METRICS_PORT set, start_http_server() serves at /metrics.
+"""
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("ATS_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
+METRICS_PORT = int(os.environ.get("ATS_METRICS_PORT", 0)) or None
+
+# Seconds; a stage slower than the last bucket only counts towards +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Powers of 4 from 1 to 16M: covers page counts, corpus sizes and PDF bytes alike
+SIZE_BUCKETS = tuple(4 ** power for power in range(13))
+
+
+class Histogram:
+    """Cumulative-bucket histogram; not thread-safe on its own"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts, total, count):
+        for i, n in enumerate(counts):
+            self.counts[i] += n
+        self.sum += total
+        self.count += count
+
+
+class Registry:
+    """Stage latencies and errors plus payload sizes, guarded by one lock"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._errors = {}
+        self._sizes = {}
+
+    def observe_latency(self, stage, seconds, error=False):
+        with self._lock:
+            histogram = self._latency.get(stage)
+            if histogram is None:
+                histogram = self._latency[stage] = Histogram(LATENCY_BUCKETS)
+                self._errors.setdefault(stage, 0)
+            histogram.observe(seconds)
+            if error:
+                self._errors[stage] += 1
+
+    def observe_error(self, stage):
+        with self._lock:
+            self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def observe_size(self, name, value):
+        with self._lock:
+            histogram = self._sizes.get(name)
+            if histogram is None:
+                histogram = self._sizes[name] = Histogram(SIZE_BUCKETS)
+            histogram.observe(value)
+
+    def drain(self):
+        """Everything recorded so far as plain data, resetting the registry"""
+        with self._lock:
+            snapshot = {
+                'latency': {stage: (h.counts, h.sum, h.count) for stage, h in self._latency.items()},
+                'errors': dict(self._errors),
+                'sizes': {name: (h.counts, h.sum, h.count) for name, h in self._sizes.items()}
+            }
+            self._latency, self._errors, self._sizes = {}, {}, {}
+        return snapshot
+
+    def merge(self, snapshot):
+        """Add a snapshot from drain(), typically one taken in a worker process"""
+        with self._lock:
+            for stage, data in snapshot['latency'].items():
+                self._latency.setdefault(stage, Histogram(LATENCY_BUCKETS)).merge(*data)
+            for stage, count in snapshot['errors'].items():
+                self._errors[stage] = self._errors.get(stage, 0) + count
+            for name, data in snapshot['sizes'].items():
+                self._sizes.setdefault(name, Histogram(SIZE_BUCKETS)).merge(*data)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            _render_histogram(
+                lines, "ats_stage_duration_seconds", "Time spent in each stage", "stage", self._latency
+            )
+            lines.append("# HELP ats_stage_errors_total Stage calls that failed")
+            lines.append("# TYPE ats_stage_errors_total counter")
+            for stage, count in sorted(self._errors.items()):
+                lines.append(f'ats_stage_errors_total{{stage="{stage}"}} {count}')
+            _render_histogram(
+                lines, "ats_payload_size", "Sizes of processed payloads (bytes, pages, documents)", "payload", self._sizes
+            )
+        return lines
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histogram(lines, metric, help_text, label, histograms):
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} histogram")
+    for key, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+            cumulative += count
+            le = bound if bound == "+Inf" else _format_value(float(bound))
+            lines.append(f'{metric}_bucket{{{label}="{key}",le="{le}"}} {cumulative}')
+        lines.append(f'{metric}_sum{{{label}="{key}"}} {_format_value(histogram.sum)}')
+        lines.append(f'{metric}_count{{{label}="{key}"}} {histogram.count}')
+
+
+registry = Registry()
+
+
+class _Timer:
+    """Context manager and decorator that records a stage's latency and errors"""
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.observe_latency(self.stage, time.perf_counter() - self._start, error=exc_type is not None)
+        return False
+
+    def __call__(self, func):
+        stage = self.stage
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __call__(self, func):
+        return func
+
+
+_null_timer = _NullTimer()
+
+
+def timed(stage):
+    """Time a block (`with timed(...)`) or every call of a function (`@timed(...)`)"""
+    return _Timer(stage) if ENABLED else _null_timer
+
+
+def record_latency(stage, seconds):
+    """Record a duration measured by the caller, for spans that cross threads or processes"""
+    if ENABLED:
+        registry.observe_latency(stage, seconds)
+
+
+def record_size(name, value):
+    if ENABLED:
+        registry.observe_size(name, value)
+
+
+def record_error(stage):
+    """Count a failure that the stage handled itself instead of raising"""
+    if ENABLED:
+        registry.observe_error(stage)
+
+
+def drain():
+    """What this process recorded since the last drain, or None while metrics are off"""
+    return registry.drain() if ENABLED else None
+
+
+def merge(snapshot):
+    if snapshot:
+        registry.merge(snapshot)
+
+
+def _metric_name(name):
+    return "ats_" + "".join(char if char.isalnum() else "_" for char in name)
+
+
+def render_prometheus(gauges=()):
+    """
+    Prometheus text exposition of every metric recorded in this process.
+
+    `gauges` adds point-in-time values such as cache statistics, as
+    (name, labels, value) tuples; names get an "ats_" prefix.
+    """
+    lines = registry.render()
+
+    by_name = {}
+    for name, labels, value in gauges:
+        by_name.setdefault(_metric_name(name), []).append((labels, value))
+    for name, samples in sorted(by_name.items()):
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{label}"' for key, label in sorted(labels.items()))
+            lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text else f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def start_http_server(port, render=render_prometheus):
+    """Serve `render()` at /metrics on a daemon thread and return the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            try:
+                body = render().encode()
+            except Exception as e:
+                logger.error(f"Metrics render error: {e}")
+                self.send_error(500)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,159 @@
+"""
+Entity extraction for resumes with spaCy.
+
+The pipeline is loaded with every component except NER (and the embedding
+layer it listens to, if any) disabled, and documents go through `nlp.pipe`
+in batches. Results are cached by document hash, so a resume only runs
+through the model once no matter how often it is re-scored.
+
+Throughput targets on one CPU core, measured with benchmarks/bench_ner.py on
+~600-word resumes:
+
+- single submission: under 75 ms per resume, a small part of the time a
+  participant waits for a score
+- bulk re-scoring: at least 20 resumes/s per core with the default batch
+  size; `n_process` (or bulk.py's worker processes, each with its own
+  pipeline) scales this with the number of cores
+
+Without spaCy or the model, extraction still returns degrees (found by
+pattern) but no organizations, dates or employment history.
+"""
+import bisect
+import logging
+import os
+import re
+
+from rules import date_ranges, find_degrees, format_month, has_degree
+
+logger = logging.getLogger(__name__)
+
+NER_MODEL = os.environ.get("ATS_NER_MODEL", "en_core_web_sm")
+
+# Bump when extract_entities output changes so cached entities are not reused
+NER_VERSION = 2
+
+# Documents per nlp.pipe batch
+BATCH_SIZE = 32
+
+# Text beyond this many characters is not run through the model
+MAX_CHARS = 100_000
+
+_institution_pattern = re.compile(r"\b(universit|college|institut|school|academy|iit|nit)", re.IGNORECASE)
+
+def load_pipeline(model=NER_MODEL):
+    """Load `model` with only NER enabled, or None if spaCy or the model is missing"""
+    try:
+        import spacy
+        nlp = spacy.load(model)
+    except ImportError:
+        logger.error("Spacy not installed; entity extraction disabled")
+        return None
+    except OSError:
+        logger.error(f"Spacy model {model} not found; entity extraction disabled")
+        return None
+
+    needed = {'ner'}
+    for name, component in nlp.pipeline:
+        if 'ner' in getattr(component, 'listening_components', []):
+            needed.add(name)
+    nlp.select_pipes(enable=[name for name in nlp.pipe_names if name in needed])
+    return nlp
+
+
+def _entities_from_doc(text, doc):
+    """Organizations, dates, degrees and employment ranges of one processed document"""
+    organizations = []
+    dates = []
+    org_lines = {}
+    line_starts = [0] + [m.end() for m in re.finditer(r"\n", text)]
+
+    def line_of(offset):
+        return bisect.bisect_right(line_starts, offset) - 1
+
+    date_spans = []
+    for ent in doc.ents if doc is not None else ():
+        value = ent.text.strip()
+        if ent.label_ == 'ORG':
+            if value not in organizations:
+                organizations.append(value)
+            org_lines.setdefault(line_of(ent.start_char), value)
+        elif ent.label_ == 'DATE':
+            if value not in dates:
+                dates.append(value)
+            date_spans.append((ent.start_char, ent.end_char))
+
+    # A date range is employment if NER tagged part of it as a date and an
+    # organization that isn't a school is named on its line or the line above
+    employment = []
+    for start, end, range_start, range_end in date_ranges(text):
+        if not any(s < range_end and e > range_start for s, e in date_spans):
+            continue
+        line = line_of(range_start)
+        organization = org_lines.get(line) or org_lines.get(line - 1)
+        if not organization or _institution_pattern.search(organization):
+            continue
+        line_text = text[line_starts[line]:line_starts[line + 1] if line + 1 < len(line_starts) else len(text)]
+        if has_degree(line_text):
+            continue
+        employment.append({
+            'organization': organization,
+            'start': format_month(start),
+            # The last month worked, where date_ranges gives the month after it
+            'end': format_month(end - 1) if end is not None else None
+        })
+
+    return {
+        'organizations': organizations,
+        'dates': dates,
+        'degrees': find_degrees(text),
+        'employment': employment
+    }
+
+
+def model_key(nlp):
+    """Identifies the model in cache keys, so entities from another model are not reused"""
+    if nlp is None:
+        return "none"
+    return f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', '')}-{nlp.meta.get('version', '')}"
+
+
+def extract_entities(texts, nlp, cache=None, batch_size=BATCH_SIZE, n_process=1):
+    """
+    Entities of each text, in order.
+
+    Texts already in `cache` (a DocumentCache) are not processed again; the
+    rest go through `nlp.pipe` in batches of `batch_size`, across `n_process`
+    processes. `nlp` may be None, in which case only degrees are found.
+    """
+    from pdf_cache import content_hash
+
+    texts = [text[:MAX_CHARS] for text in texts]
+    suffix = f"{model_key(nlp)}:{NER_VERSION}"
+    keys = [f"{content_hash(text)}:{suffix}" for text in texts]
+    results = [None] * len(texts)
+
+    if cache:
+        for i, key in enumerate(keys):
+            try:
+                results[i] = cache.get_entities(key)
+            except Exception as e:
+                logger.error(f"Document cache read error: {e}")
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+
+    if nlp is None:
+        docs = [None] * len(missing)
+    else:
+        docs = nlp.pipe((texts[i] for i in missing), batch_size=batch_size, n_process=n_process)
+
+    for i, doc in zip(missing, docs):
+        results[i] = _entities_from_doc(texts[i], doc)
+        if cache:
+            try:
+                cache.put_entities(keys[i], results[i])
+            except Exception as e:
+                logger.error(f"Document cache write error: {e}")
+
+    return results
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get(
+    "ATS_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ats_cache.sqlite3")
+)
+MAX_CACHE_BYTES = int(os.environ.get("ATS_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Cache hits record their access time in memory and write it back in one
+# transaction once this many are pending or the oldest is this many seconds old
+TOUCH_BATCH = 64
+TOUCH_INTERVAL = 30
+
+
+def content_hash(data):
+    """SHA-256 hex digest of bytes or text"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class DocumentCache:
+    """
+    On-disk LRU cache for extracted PDF text, parsed resumes and entities.
+
+    Entries are keyed by content hash, so identical uploads hit regardless of
+    file name or participant. Data lives in SQLite, survives restarts and is
+    safe to share between processes. Once the stored values exceed
+    `max_bytes`, the least recently used entries are evicted.
+
+    The total size is kept in a one-row table, updated in the same transaction
+    as each write, so no write has to sum the whole table. Access times from
+    cache hits are written in batches, so reads do not contend for the writer
+    lock; the LRU order may lag by up to TOUCH_INTERVAL seconds.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._touched = {}
+        self._next_flush = time.monotonic() + TOUCH_INTERVAL
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)")
+        # Caches created before the totals table are summed once here
+        self._conn.execute(
+            "INSERT OR IGNORE INTO totals (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries"
+        )
+
+    def _get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH or time.monotonic() >= self._next_flush:
+                try:
+                    with _Transaction(self._conn):
+                        self._flush_touched()
+                except sqlite3.Error as e:
+                    logger.error(f"Document cache access time update error: {e}")
+            return row[0]
+
+    def _flush_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched = {}
+        self._next_flush = time.monotonic() + TOUCH_INTERVAL
+
+    def _put(self, key, value):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock, _Transaction(self._conn):
+            self._flush_touched()
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            total = self._add_bytes(size - (row[0] if row else 0))
+            if total > self.max_bytes:
+                self._evict(total)
+
+    def _add_bytes(self, delta):
+        self._conn.execute("UPDATE totals SET bytes = bytes + ? WHERE id = 0", (delta,))
+        return self._conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+
+    def _evict(self, total):
+        freed = 0
+        while total - freed > self.max_bytes:
+            oldest = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                freed += size
+                if total - freed <= self.max_bytes:
+                    break
+        self._add_bytes(-freed)
+
+    def get_text(self, pdf_hash):
+        return self._get(f"text:{pdf_hash}")
+
+    def put_text(self, pdf_hash, text):
+        self._put(f"text:{pdf_hash}", text)
+
+    def get_parsed(self, key):
+        value = self._get(f"parsed:{key}")
+        return json.loads(value) if value is not None else None
+
+    def put_parsed(self, key, parsed):
+        self._put(f"parsed:{key}", json.dumps(parsed))
+
+    def get_entities(self, key):
+        value = self._get(f"entities:{key}")
+        return json.loads(value) if value is not None else None
+
+    def put_entities(self, key, entities):
+        self._put(f"entities:{key}", json.dumps(entities))
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self._conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+        return {'entries': count, 'bytes': total, 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        with self._lock, _Transaction(self._conn):
+            self._touched = {}
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("UPDATE totals SET bytes = 0 WHERE id = 0")
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error, for an autocommit connection"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __enter__(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -0,0 +1,489 @@
+import re
+import threading
+import logging
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2 ** 20
+
+# MinHash / LSH parameters: 64 bands of 2 rows put the candidate threshold at
+# roughly 0.125 Jaccard over word 3-shingles. That reliably finds near-duplicates
+# but misses many documents in the 40-60% cosine band, so scores use the full
+# scan and LSH is only a pre-filter for callers that opt in.
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 64
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, (1 << 32) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 32) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+_word_pattern = re.compile(r"\w+")
+_vectorizer = None
+
+# First byte of an encoded term vector. Stored fingerprints are only comparable
+# while N_FEATURES, the vectorizer settings and the MinHash permutations stay fixed.
+FINGERPRINT_VERSION = 1
+
+
+def build_vectorizer():
+    """Stateless vectorizer, so new documents never require a refit"""
+    return HashingVectorizer(
+        stop_words='english',
+        ngram_range=(1, 2),
+        n_features=N_FEATURES,
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32
+    )
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """What the index needs of a document: hashed n-gram counts and a MinHash signature"""
+    indices: np.ndarray
+    counts: np.ndarray
+    signature: np.ndarray
+
+
+def fingerprint_texts(texts):
+    """Fingerprints of `texts`, vectorised in one pass"""
+    global _vectorizer
+    if _vectorizer is None:
+        _vectorizer = build_vectorizer()
+
+    counts = _vectorizer.transform(texts)
+    counts.sum_duplicates()
+    return [
+        Fingerprint(
+            indices=counts.indices[counts.indptr[i]:counts.indptr[i + 1]].copy(),
+            counts=counts.data[counts.indptr[i]:counts.indptr[i + 1]].copy(),
+            signature=minhash_signature(text)
+        )
+        for i, text in enumerate(texts)
+    ]
+
+
+def fingerprint(text):
+    return fingerprint_texts([text])[0]
+
+
+def encode_fingerprint(fp):
+    """(term_vector, signature) bytes for storage; the term vector is delta-encoded and compressed"""
+    deltas = np.diff(fp.indices, prepend=0).astype('<u4')
+    counts = np.minimum(fp.counts, np.iinfo(np.uint16).max).astype('<u2')
+    term_vector = bytes([FINGERPRINT_VERSION]) + zlib.compress(deltas.tobytes() + counts.tobytes())
+    return term_vector, fp.signature.astype('<u4').tobytes()
+
+
+def decode_fingerprint(term_vector, signature):
+    if not term_vector or term_vector[0] != FINGERPRINT_VERSION:
+        raise ValueError("Unsupported fingerprint version")
+
+    payload = zlib.decompress(term_vector[1:])
+    n_terms = len(payload) // 6
+    deltas = np.frombuffer(payload, dtype='<u4', count=n_terms)
+    counts = np.frombuffer(payload, dtype='<u2', offset=n_terms * 4)
+    return Fingerprint(
+        indices=np.cumsum(deltas).astype(np.int32),
+        counts=counts.astype(np.float32),
+        signature=np.frombuffer(signature, dtype='<u4').astype(np.uint32)
+    )
+
+
+def counts_matrix(fingerprints):
+    """CSR matrix of raw counts with one row per fingerprint"""
+    indptr = np.zeros(len(fingerprints) + 1, dtype=np.int32)
+    np.cumsum([len(fp.indices) for fp in fingerprints], out=indptr[1:])
+    if not fingerprints:
+        return sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+    return sp.csr_matrix(
+        (np.concatenate([fp.counts for fp in fingerprints]),
+         np.concatenate([fp.indices for fp in fingerprints]),
+         indptr),
+        shape=(len(fingerprints), N_FEATURES)
+    )
+
+
+def idf_weights(doc_freq, n_docs):
+    """Smoothed IDF, the same weights TfidfTransformer() would fit"""
+    return (np.log((1 + n_docs) / (1 + doc_freq)) + 1).astype(np.float32)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Stable 32-bit hashes of the word `size`-grams in `text`"""
+    words = _word_pattern.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text):
+    """MinHash signature (NUM_PERMUTATIONS uint32 values) of the word shingles of `text`"""
+    hashes = np.fromiter(shingles(text), dtype=np.uint64)
+    if hashes.size == 0:
+        return np.full(NUM_PERMUTATIONS, _MAX_HASH, dtype=np.uint32)
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_keys(signatures):
+    """One uint64 key per LSH band for each row of an (n, NUM_PERMUTATIONS) signature array"""
+    bands = signatures.reshape(-1, LSH_BANDS, LSH_ROWS).astype(np.uint64)
+    keys = np.zeros(bands.shape[:2], dtype=np.uint64)
+    # Exact for up to two 32-bit rows per band; wider bands fold and may
+    # collide, which only adds candidates that the exact check then rejects
+    for row in range(LSH_ROWS):
+        keys = (keys << np.uint64(32)) ^ bands[:, :, row]
+    return keys
+
+
+def stack_rows(blocks):
+    """Stack a list of CSR blocks, releasing each block as soon as it is copied"""
+    n_rows = sum(block.shape[0] for block in blocks)
+    nnz = sum(block.nnz for block in blocks)
+    index_dtype = np.int32 if nnz < 2 ** 31 else np.int64
+    data = np.empty(nnz, dtype=np.float32)
+    indices = np.empty(nnz, dtype=index_dtype)
+    indptr = np.empty(n_rows + 1, dtype=index_dtype)
+    indptr[0] = 0
+
+    row = position = 0
+    while blocks:
+        block = blocks.pop(0)
+        data[position:position + block.nnz] = block.data
+        indices[position:position + block.nnz] = block.indices
+        indptr[row + 1:row + block.shape[0] + 1] = block.indptr[1:] + position
+        row += block.shape[0]
+        position += block.nnz
+        del block
+
+    return sp.csr_matrix((data, indices, indptr), shape=(n_rows, N_FEATURES))
+
+
+class LSHBuckets:
+    """
+    Banded locality-sensitive hash table over MinHash signatures.
+
+    Each band is a sorted array of keys with the matching document ids, so a
+    lookup is a binary search and a stored document costs about 12 bytes per
+    band. New documents go to a small unsorted tail that is merged in once it
+    grows past an eighth of the sorted part.
+    """
+
+    def __init__(self):
+        self._keys = np.empty((LSH_BANDS, 0), dtype=np.uint64)
+        self._ids = np.empty((LSH_BANDS, 0), dtype=np.int32)
+        self._pending_keys = []
+        self._pending_ids = []
+        self._pending_count = 0
+
+    def insert(self, doc_id, signature):
+        self.insert_many(doc_id, signature[np.newaxis, :])
+
+    def insert_many(self, first_id, signatures):
+        """Insert consecutive documents first_id, first_id + 1, ... with the given signatures"""
+        if len(signatures) == 0:
+            return
+        self._pending_keys.append(band_keys(signatures))
+        self._pending_ids.append(np.arange(first_id, first_id + len(signatures), dtype=np.int32))
+        self._pending_count += len(signatures)
+        if self._pending_count > max(1000, self._keys.shape[1] // 8):
+            self._merge()
+
+    def _merge(self):
+        if not self._pending_count:
+            return
+        pending_keys = np.concatenate(self._pending_keys).T
+        pending_ids = np.concatenate(self._pending_ids)
+        size = self._keys.shape[1] + len(pending_ids)
+        keys = np.empty((LSH_BANDS, size), dtype=np.uint64)
+        ids = np.empty((LSH_BANDS, size), dtype=np.int32)
+        for band in range(LSH_BANDS):
+            merged_keys = np.concatenate([self._keys[band], pending_keys[band]])
+            merged_ids = np.concatenate([self._ids[band], pending_ids])
+            order = np.argsort(merged_keys, kind='stable')
+            keys[band] = merged_keys[order]
+            ids[band] = merged_ids[order]
+        self._keys = keys
+        self._ids = ids
+        self._pending_keys = []
+        self._pending_ids = []
+        self._pending_count = 0
+
+    def candidates(self, signature):
+        keys = band_keys(signature[np.newaxis, :])[0]
+        found = set()
+        for band in range(LSH_BANDS):
+            sorted_keys = self._keys[band]
+            start = np.searchsorted(sorted_keys, keys[band], side='left')
+            end = np.searchsorted(sorted_keys, keys[band], side='right')
+            if end > start:
+                found.update(self._ids[band, start:end].tolist())
+
+        if self._pending_count:
+            pending_keys = np.concatenate(self._pending_keys)
+            matches = (pending_keys == keys).any(axis=1)
+            found.update(np.concatenate(self._pending_ids)[matches].tolist())
+        return found
+
+
+def _max_similarity(rows, vector, skip=()):
+    """Largest dot product of `vector` with `rows`, ignoring the row positions in `skip`"""
+    similarities = rows @ vector.T
+    if not similarities.nnz:
+        return 0.0
+    if skip:
+        similarities = similarities.toarray().ravel()
+        similarities[skip] = 0.0
+    return float(similarities.max())
+
+
+class PlagiarismIndex:
+    """
+    Persistent similarity index over the resume corpus.
+
+    Documents are hashed into a fixed feature space and stored as L2-normalised
+    TF-IDF rows. The IDF weights are refitted only on rebuild; documents added
+    in between reuse the frozen weights, so adding or querying a resume costs
+    one vectorisation plus a single sparse dot product. Rebuilds consume the
+    corpus in batches, so the raw text of only one batch is in memory at a time.
+
+    Documents can be given as text or as stored Fingerprints; fingerprints skip
+    tokenisation and shingling and index to exactly the same rows. Either may
+    be paired with its owner as `(owner, document)`, so that a query can skip
+    the submitter's own earlier uploads.
+
+    Queries compare against every row. With exhaustive=False they instead look
+    up near-duplicate candidates in MinHash/LSH buckets and compute the exact
+    cosine similarity for those rows only, which is faster on large indexes
+    but can miss partial copies.
+    """
+
+    def __init__(self):
+        self._vectorizer = build_vectorizer()
+        self._idf = None
+        self._matrix = sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self._pending = []
+        self._pending_rows = 0
+        self._rows_by_owner = {}
+        self._buckets = LSHBuckets()
+        self._lock = threading.RLock()
+        self._rebuilding = False
+        self._added_during_rebuild = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def size(self):
+        with self._lock:
+            return self._matrix.shape[0] + self._pending_rows
+
+    def _weigh(self, counts, idf):
+        """Apply IDF weights (if fitted) and L2-normalise the rows, in place"""
+        if idf is not None:
+            counts.data *= idf[counts.indices]
+        return normalize(counts, copy=False)
+
+    def _vectorize(self, texts):
+        counts = self._vectorizer.transform(texts)
+        with self._lock:
+            idf = self._idf
+        return self._weigh(counts, idf)
+
+    def _fingerprints(self, items):
+        """
+        (owners, fingerprints) for a mix of texts, Fingerprints and `(owner, document)`
+        pairs, dropping empty documents. Unpaired documents have no owner (None).
+        """
+        pairs = [item if isinstance(item, tuple) else (None, item) for item in items]
+        texts = [doc for _, doc in pairs if isinstance(doc, str) and doc.strip()]
+        computed = iter(fingerprint_texts(texts)) if texts else iter(())
+        owners = []
+        fingerprints = []
+        for owner, doc in pairs:
+            if isinstance(doc, Fingerprint):
+                if not len(doc.indices):
+                    continue
+            elif isinstance(doc, str) and doc.strip():
+                doc = next(computed)
+            else:
+                continue
+            owners.append(owner)
+            fingerprints.append(doc)
+        return owners, fingerprints
+
+    def _track_owners(self, rows_by_owner, first_row, owners):
+        for row, owner in enumerate(owners, first_row):
+            if owner is not None:
+                rows_by_owner.setdefault(owner, []).append(row)
+
+    def _stacked_pending(self):
+        """Rows added since the last compaction, as one CSR block (or None)"""
+        if len(self._pending) > 1:
+            self._pending = [sp.vstack(self._pending, format='csr')]
+        return self._pending[0] if self._pending else None
+
+    def _compact(self):
+        """
+        Fold the pending rows into the main matrix once they outgrow an eighth of it.
+
+        Queries multiply the two separately, so most additions never copy the
+        main matrix; compacting only when the tail is large keeps the copies
+        amortised, the same way LSHBuckets merges its tail.
+        """
+        if self._pending_rows > max(1000, self._matrix.shape[0] // 8):
+            self._matrix = sp.vstack([self._matrix] + self._pending, format='csr')
+            self._pending = []
+            self._pending_rows = 0
+
+    def rebuild(self, documents):
+        """Refit IDF weights and replace the stored matrix with `documents`"""
+        return self.rebuild_batches([documents])
+
+    def rebuild_batches(self, batches):
+        """
+        Refit IDF weights and replace the stored matrix with the documents in `batches`.
+
+        `batches` is any iterable of lists of texts or Fingerprints, optionally
+        paired with their owners, such as pages read from the database. Document frequencies are accumulated as batches arrive and the
+        IDF weights are applied to the stored counts once the last one is in.
+        """
+        with self._lock:
+            self._rebuilding = True
+            self._added_during_rebuild = []
+
+        try:
+            buckets = LSHBuckets()
+            rows_by_owner = {}
+            doc_freq = np.zeros(N_FEATURES, dtype=np.int64)
+            counts_batches = []
+            n_docs = 0
+            for batch in batches:
+                owners, fingerprints = self._fingerprints(batch)
+                if not fingerprints:
+                    continue
+                self._track_owners(rows_by_owner, n_docs, owners)
+                counts = counts_matrix(fingerprints)
+                doc_freq += np.bincount(counts.indices, minlength=N_FEATURES)
+                counts_batches.append(counts)
+                buckets.insert_many(n_docs, np.array([fp.signature for fp in fingerprints]))
+                n_docs += len(fingerprints)
+
+            if n_docs:
+                idf = idf_weights(doc_freq, n_docs)
+                for counts in counts_batches:
+                    self._weigh(counts, idf)
+                matrix = stack_rows(counts_batches)
+            else:
+                idf = None
+                matrix = sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        except Exception:
+            with self._lock:
+                self._rebuilding = False
+                self._added_during_rebuild = []
+            raise
+
+        with self._lock:
+            self._idf = idf
+            self._matrix = matrix
+            self._pending = []
+            self._pending_rows = 0
+            self._rows_by_owner = rows_by_owner
+            self._buckets = buckets
+            late_additions = self._added_during_rebuild
+            self._rebuilding = False
+            self._added_during_rebuild = []
+
+        if late_additions:
+            self.add_many(late_additions)
+
+        return self.size
+
+    def add(self, document, owner=None):
+        """Add one text or Fingerprint, optionally recording who submitted it"""
+        self.add_many([(owner, document)])
+
+    def add_many(self, documents):
+        owners, fingerprints = self._fingerprints(documents)
+        if not fingerprints:
+            return
+
+        counts = counts_matrix(fingerprints)
+        signatures = np.array([fp.signature for fp in fingerprints])
+        with self._lock:
+            rows = self._weigh(counts, self._idf)
+            first_row = self.size
+            self._buckets.insert_many(first_row, signatures)
+            self._track_owners(self._rows_by_owner, first_row, owners)
+            self._pending.append(rows)
+            self._pending_rows += rows.shape[0]
+            self._compact()
+            if self._rebuilding:
+                self._added_during_rebuild.extend(zip(owners, fingerprints))
+
+    def query(self, text, exhaustive=True, exclude_owner=None):
+        """
+        Return the highest cosine similarity (0-1) between `text` and the index.
+
+        Documents added with `exclude_owner` as their owner are ignored, so a
+        participant's resubmission is not matched against their own uploads.
+        With exhaustive=False only the LSH candidates are scored, so documents
+        below near-duplicate similarity may be missed.
+        """
+        if not text or not text.strip():
+            return 0.0
+
+        vector = self._vectorize([text])
+        signature = None if exhaustive else minhash_signature(text)
+
+        with self._lock:
+            matrix = self._matrix
+            pending = self._stacked_pending()
+            excluded = set(self._rows_by_owner.get(exclude_owner, ())) if exclude_owner is not None else set()
+            candidates = None if exhaustive else self._buckets.candidates(signature) - excluded
+
+        best = 0.0
+        offset = 0
+        for block in (matrix, pending):
+            if block is None or block.shape[0] == 0:
+                continue
+            end = offset + block.shape[0]
+            if candidates is not None:
+                rows = sorted(row - offset for row in candidates if offset <= row < end)
+                if rows:
+                    best = max(best, _max_similarity(block[rows], vector))
+            else:
+                skip = [row - offset for row in excluded if offset <= row < end]
+                best = max(best, _max_similarity(block, vector, skip))
+            offset = end
+        return best
+
+    def start_background_rebuild(self, fetch_batches, interval):
+        """Periodically rebuild from the batches returned by `fetch_batches()` on a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.rebuild_batches(fetch_batches())
+                except Exception as e:
+                    logger.error(f"Plagiarism index rebuild error: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name="plagiarism-index-rebuild", daemon=True)
+        self._thread.start()
+
+    def stop_background_rebuild(self):
+        self._stop.set()
@@ -0,0 +1,163 @@
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Seconds between sweeps for expired entries whose keys are never read again
+SWEEP_INTERVAL = 60
+
+
+class ReadCache:
+    """
+    Process-wide TTL cache for database reads, with hit/miss counters.
+
+    Concurrent misses on the same key are coalesced: the first caller runs the
+    fetch and the others wait for its result, so a burst of page loads costs a
+    single round trip. A fetch that was started before an invalidation is
+    returned to its callers but not stored. Expired entries are dropped when
+    they are next looked up, and the rest by a sweep on a miss at most every
+    SWEEP_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._inflight = {}
+        self._generations = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+
+    def _counters(self, name):
+        counters = self._stats.get(name)
+        if counters is None:
+            counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0, 'errors': 0}
+            self._stats[name] = counters
+        return counters
+
+    def get_or_fetch(self, name, key, ttl, fetch):
+        cache_key = (name, key)
+
+        with self._lock:
+            counters = self._counters(name)
+            now = time.monotonic()
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                if entry[0] > now:
+                    counters['hits'] += 1
+                    return entry[1]
+                del self._entries[cache_key]
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            pending = self._inflight.get(cache_key)
+            if pending is not None:
+                counters['coalesced'] += 1
+            else:
+                counters['misses'] += 1
+                future = Future()
+                self._inflight[cache_key] = future
+                generation = self._generations.get(name, 0)
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                counters['errors'] += 1
+                del self._inflight[cache_key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if self._generations.get(name, 0) == generation:
+                self._entries[cache_key] = (time.monotonic() + ttl, value)
+            del self._inflight[cache_key]
+        future.set_result(value)
+        return value
+
+    def _sweep(self, now):
+        for cache_key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[cache_key]
+        self._next_sweep = now + SWEEP_INTERVAL
+
+    def invalidate(self, name, key=None):
+        """Drop every cached entry of `name`, or only the one for `key`"""
+        with self._lock:
+            self._counters(name)['invalidations'] += 1
+            self._generations[name] = self._generations.get(name, 0) + 1
+            if key is not None:
+                self._entries.pop((name, key), None)
+            else:
+                for cache_key in [k for k in self._entries if k[0] == name]:
+                    del self._entries[cache_key]
+
+    def stats(self):
+        """One row of counters per cached function"""
+        now = time.monotonic()
+        with self._lock:
+            live = {}
+            for (name, _), (expires, _) in self._entries.items():
+                if expires > now:
+                    live[name] = live.get(name, 0) + 1
+
+            rows = []
+            for name, counters in sorted(self._stats.items()):
+                lookups = counters['hits'] + counters['misses'] + counters['coalesced']
+                rows.append({
+                    'function': name,
+                    'entries': live.get(name, 0),
+                    **counters,
+                    'hit_rate': (counters['hits'] + counters['coalesced']) / lookups if lookups else 0.0
+                })
+            return rows
+
+    def clear(self):
+        with self._lock:
+            for name in self._stats:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            self._entries.clear()
+
+
+read_cache = ReadCache()
+
+
+def _cache_key(args, kwargs):
+    return args, tuple(sorted(kwargs.items()))
+
+
+def cached_read(ttl, fallback=None):
+    """
+    Cache a read function's return value for `ttl` seconds, keyed by its arguments.
+
+    A read that raises is not cached. With `fallback`, the error is logged and
+    `fallback()` is returned in its place, so callers get e.g. an empty table
+    while the next call tries the database again.
+
+    The wrapped function gets an `invalidate(*args, **kwargs)` attribute; called
+    without arguments it drops every cached result of the function.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return read_cache.get_or_fetch(
+                    func.__name__, _cache_key(args, kwargs), ttl, lambda: func(*args, **kwargs)
+                )
+            except Exception as e:
+                if fallback is None:
+                    raise
+                logger.error(f"{func.__name__} error: {e}")
+                return fallback()
+
+        def invalidate(*args, **kwargs):
+            key = _cache_key(args, kwargs) if args or kwargs else None
+            read_cache.invalidate(func.__name__, key)
+
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
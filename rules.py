@@ -0,0 +1,217 @@
+"""
+Precompiled patterns for the rule-based resume and JD extractors.
+
+Every pattern is compiled once, at import. Patterns that feed the same
+extractor are merged into one alternation with named groups, so each
+extractor scans a document once. Extractors take optional `start`/`end`
+offsets (such as a section span from segment_sections) and search in place
+instead of slicing or lower-casing a copy.
+"""
+import re
+from datetime import date
+
+EDUCATION_DEGREES = ['bachelor', 'b.tech', 'b.e.', 'bsc', 'master', 'm.tech', 'm.sc', 'phd', 'mba']
+EDUCATION_FIELDS = [
+    'computer science', 'software engineering', 'information technology',
+    'electrical engineering', 'electronics', 'data science', 'artificial intelligence'
+]
+
+# Claims above this are ignored as typos rather than counted
+MAX_EXPERIENCE_YEARS = 50
+# Assumed when a JD doesn't state one
+DEFAULT_REQUIRED_EXPERIENCE = 2
+
+# "5 years of experience", "experience: 5 years", "5 years in ..." and
+# "worked for 5 years". Trailing context is a lookahead so a match never
+# consumes the start of the next one; the leading lookahead lets the engine
+# skip positions that can't start any branch.
+_experience_pattern = re.compile(
+    r"(?=[ew\d])(?:"
+    r"(?:experience[:\s]+|worked\s+for\s+)(?P<leading>\d+)\+?\s*years?"
+    r"|(?P<trailing>\d+)\+?\s*years?(?=\s+(?:of\s+)?experience|\s+in\s))",
+    re.IGNORECASE
+)
+
+_required_experience_pattern = re.compile(r"(\d+)\+?\s*years?", re.IGNORECASE)
+
+_cgpa_pattern = re.compile(r"(?:cgpa|gpa|grade)[:\s]*(\d+\.?\d*)\s*(?:/\s*(\d+\.?\d*))?", re.IGNORECASE)
+
+# Longest first, so a term is never cut short by another that starts it
+_education_term_pattern = re.compile(
+    "|".join(re.escape(term) for term in sorted(EDUCATION_DEGREES + EDUCATION_FIELDS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+_degree_pattern = re.compile(
+    r"\b(ph\.?\s?d|doctorate|master(?:'?s)?|bachelor(?:'?s)?|mba|"
+    r"[bm]\.\s?tech|[bm]tech|[bm]\.\s?e\.|[bm]\.?\s?sc|[bm]\.\s?s\.|[bm]\.\s?a\.|"
+    r"bca|mca|b\.?\s?com|associate(?:'?s)? degree)(?![a-z])",
+    re.IGNORECASE
+)
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+
+def _date_pattern(prefix):
+    return (
+        rf"(?:\b(?P<{prefix}_month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*"
+        rf"|(?<!\d)(?P<{prefix}_num>0?[1-9]|1[0-2])\s*[/.-]\s*)?"
+        rf"(?<!\d)(?P<{prefix}_year>(?:19|20)\d{{2}})(?!\d)"
+    )
+
+
+# "Jan 2019 - Mar 2022", "06/2017 to 08/2019", "2018 – Present"
+_date_range_pattern = re.compile(
+    _date_pattern("start")
+    + r"\s*(?:-|–|—|to|until|till)\s*(?:"
+    + _date_pattern("end")
+    + r"|(?P<present>present|current|now|today|date)\b)",
+    re.IGNORECASE
+)
+
+# Every range has a start year followed by a separator. Finding those first is
+# far cheaper than trying the full pattern at every position, which then only
+# runs on a short window around each one.
+_range_start_pattern = re.compile(r"(?<!\d)(?:19|20)\d{2}\s*(?:-|–|—|to|until|till)", re.IGNORECASE)
+# Longest start-date prefix ("September, ") and end date ("September, 2022") around it
+_RANGE_PREFIX_CHARS = 16
+_RANGE_SUFFIX_CHARS = 32
+
+
+def _bounds(text, start, end):
+    return start, len(text) if end is None else end
+
+
+def stated_experience_years(text, start=0, end=None):
+    """Largest number of years of experience the text claims, or 0"""
+    years = 0
+    for match in _experience_pattern.finditer(text, *_bounds(text, start, end)):
+        value = int(match.group('leading') or match.group('trailing'))
+        if value <= MAX_EXPERIENCE_YEARS:
+            years = max(years, value)
+    return years
+
+
+def required_experience_years(job_description):
+    """Years of experience a JD asks for: the first "N years" it mentions"""
+    match = _required_experience_pattern.search(job_description)
+    years = int(match.group(1)) if match else DEFAULT_REQUIRED_EXPERIENCE
+    return years or 1
+
+
+def cgpa_claims(text, start=0, end=None):
+    """(value, scale) for every CGPA/GPA/grade claim; the scale defaults to 10"""
+    claims = []
+    for value, scale in _cgpa_pattern.findall(text, *_bounds(text, start, end)):
+        try:
+            claims.append((float(value), float(scale) if scale else 10.0))
+        except ValueError:
+            continue
+    return claims
+
+
+def education_terms(text, start=0, end=None):
+    """The EDUCATION_DEGREES and EDUCATION_FIELDS that occur in the text"""
+    return {match.group().lower() for match in _education_term_pattern.finditer(text, *_bounds(text, start, end))}
+
+
+def find_degrees(text, start=0, end=None):
+    """Degree mentions in order of appearance, normalised to lower case without spaces"""
+    degrees = []
+    for match in _degree_pattern.finditer(text, *_bounds(text, start, end)):
+        degree = re.sub(r"\s+", "", match.group(1).lower())
+        if degree not in degrees:
+            degrees.append(degree)
+    return degrees
+
+
+def has_degree(text, start=0, end=None):
+    return _degree_pattern.search(text, *_bounds(text, start, end)) is not None
+
+
+def _month_index(match, prefix):
+    year = int(match.group(f"{prefix}_year"))
+    month_name = match.group(f"{prefix}_month")
+    if month_name:
+        month = _MONTHS[month_name.lower()]
+    elif match.group(f"{prefix}_num"):
+        month = int(match.group(f"{prefix}_num"))
+    else:
+        month = 1
+    return year * 12 + month - 1
+
+
+def format_month(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def parse_month(value):
+    year, month = value.split("-")
+    return int(year) * 12 + int(month) - 1
+
+
+def date_ranges(text, start=0, end=None):
+    """
+    (start month, end month, start offset, end offset) for every date range.
+
+    Months are indexes (year * 12 + month - 1) and the end month is exclusive:
+    "Jan 2020 - Dec 2020" ends at Jan 2021, while a bare end year ends at its
+    January, so "2019 - 2021" covers two years. The end month is None for
+    ranges that run to the present. Ranges that cover no month, such as
+    "2021 - 2019" or "2019 - 2019", are skipped.
+    """
+    start, end = _bounds(text, start, end)
+    ranges = []
+    previous_end = start
+    for candidate in _range_start_pattern.finditer(text, start, end):
+        if candidate.start() < previous_end:
+            continue
+        window = (max(previous_end, candidate.start() - _RANGE_PREFIX_CHARS), min(end, candidate.end() + _RANGE_SUFFIX_CHARS))
+        match = next(
+            (m for m in _date_range_pattern.finditer(text, *window) if m.start("start_year") == candidate.start()),
+            None
+        )
+        if match is None:
+            continue
+        previous_end = match.end()
+        first = _month_index(match, "start")
+        last = None if match.group("present") else _month_index(match, "end")
+        if last is not None:
+            if match.group("end_month") or match.group("end_num"):
+                last += 1
+            if last <= first:
+                continue
+        ranges.append((first, last, match.start(), match.end()))
+    return ranges
+
+
+def months_covered(intervals, today=None):
+    """
+    Total months covered by half-open (start, end) month intervals, counting
+    overlaps once. An end of None runs through the current month.
+    """
+    today = today or date.today()
+    now = today.year * 12 + today.month
+
+    total = 0
+    current_start, current_end = None, None
+    for start, end in sorted((start, now if end is None else min(end, now)) for start, end in intervals):
+        if end <= start:
+            continue
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def employment_intervals(employment):
+    """Month intervals of employment entries as produced by ner.extract_entities"""
+    return [(parse_month(job['start']), parse_month(job['end']) + 1 if job['end'] else None) for job in employment]
@@ -0,0 +1,154 @@
+"""
+Single-pass resume section segmentation.
+
+segment_sections finds the few lines that could be headings with C-level
+searches over the whole text, checks only those in Python, and returns the
+character span of the body of every recognised section. Callers search
+within those spans instead of re-scanning the resume for each section.
+"""
+import re
+
+# Checked in this order, so "Academic Projects" is projects and not education
+SECTION_HEADINGS = {
+    'projects': ('project',),
+    'experience': ('experience', 'employment', 'work history', 'internship'),
+    'education': ('education', 'academic', 'qualification'),
+    'skills': ('skill',),
+    'certifications': ('certification', 'certificate', 'licens'),
+}
+
+# Longer lines are never headings
+MAX_HEADING_CHARS = 50
+MAX_HEADING_WORDS = 5
+
+# Words that may accompany a section keyword in a heading ("Technical Skills",
+# "Education Details", "Skills & Interests"). A line with any other word, such
+# as a project called "Education Portal", is body text.
+HEADING_WORDS = frozenset({
+    'work', 'professional', 'relevant', 'personal', 'key', 'technical', 'core', 'selected',
+    'other', 'additional', 'notable', 'major', 'industry', 'research', 'volunteer', 'student',
+    'soft', 'computer', 'programming', 'software', 'my', 'and', '&', 'of',
+    'details', 'history', 'background', 'summary', 'interests', 'achievements', 'awards',
+    'tools', 'technologies', 'languages', 'coursework', 'courses', 'training', 'activities',
+})
+
+_heading_patterns = [
+    (name, re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")", re.IGNORECASE))
+    for name, keywords in SECTION_HEADINGS.items()
+]
+
+_keywords = [keyword for keywords in SECTION_HEADINGS.values() for keyword in keywords]
+
+_keyword_word_pattern = re.compile(
+    "(?:" + "|".join(re.escape(keyword) for keyword in _keywords if " " not in keyword) + ")"
+)
+_phrase_keywords = [keyword for keyword in _keywords if " " in keyword]
+_heading_word_pattern = re.compile(r"[^\W\d_]+|&")
+
+# Lines with no lower-case letters; the leading newline lets the regex engine
+# jump between line starts instead of trying every position
+_caps_line_pattern = re.compile(r"\n[^a-z\n]*[A-Z][^a-z\n]*(?=\n)")
+
+
+def _candidate_lines(text):
+    """Start offsets of lines that name a section or are in capitals, in order"""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Lower-casing changed some offsets; keep them aligned with `text`
+        lowered = "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+    starts = set()
+    for keyword in _keywords:
+        position = lowered.find(keyword)
+        while position != -1:
+            starts.add(text.rfind("\n", 0, position) + 1)
+            position = lowered.find(keyword, position + len(keyword))
+    for match in _caps_line_pattern.finditer("\n" + text + "\n"):
+        starts.add(match.start())
+    return sorted(starts)
+
+
+def _is_heading_phrase(text):
+    """
+    True if `text`, ignoring case, punctuation and numbering, is nothing but a
+    heading: "Projects", "WORK EXPERIENCE", "2. technical skills:". False for
+    "Online Certificate Generator" or "Built a project in Python".
+    """
+    words = _heading_word_pattern.findall(text.lower())
+    if not words or len(words) > MAX_HEADING_WORDS:
+        return False
+    has_keyword = any(keyword in " ".join(words) for keyword in _phrase_keywords)
+    for word in words:
+        if _keyword_word_pattern.match(word):
+            has_keyword = True
+        elif word not in HEADING_WORDS:
+            return False
+    return has_keyword
+
+
+def _heading(line):
+    """(section name, offset of inline body) if `line` is a known heading, else (None, None)"""
+    head, colon, _ = line.partition(":")
+    candidate = head if colon else line
+    if len(candidate) >= MAX_HEADING_CHARS or not _is_heading_phrase(candidate):
+        return None, None
+    for name, pattern in _heading_patterns:
+        if pattern.search(candidate):
+            return name, len(head) + 1 if colon else len(line)
+    return None, None
+
+
+def _trim(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def segment_sections(text):
+    """
+    Map each section found in `text` to the (start, end) span of its body.
+
+    A section starts at a line that is only a heading for one of
+    SECTION_HEADINGS (its body may follow a colon on the same line), and ends
+    at the next heading for another section or at any other short all-caps
+    line, such as "SUMMARY". Lines that merely mention a keyword, like a
+    project named "Skill Swap Platform", stay in the body. Only the first
+    occurrence of a section is kept. Spans exclude surrounding whitespace
+    and may be empty.
+    """
+    sections = {}
+    current, body_start = None, 0
+
+    for line_start in _candidate_lines(text):
+        line_end = text.find("\n", line_start)
+        if line_end == -1:
+            line_end = len(text)
+        line = text[line_start:line_end]
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        name, body_offset = _heading(stripped)
+        if name is not None and name == current:
+            # "Project: Voting App" inside PROJECTS continues the section
+            continue
+        ends_section = name is not None or (stripped.isupper() and len(stripped) < MAX_HEADING_CHARS)
+        if not ends_section:
+            continue
+        if current is not None:
+            sections[current] = _trim(text, body_start, line_start)
+            current = None
+        if name is not None and name not in sections:
+            current = name
+            body_start = line_start + line.index(stripped) + body_offset
+
+    if current is not None:
+        sections[current] = _trim(text, body_start, len(text))
+    return sections
+
+
+def section_text(text, sections, name):
+    start, end = sections.get(name, (0, 0))
+    return text[start:end]
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = os.environ.get(
+    "ATS_SKILL_TAXONOMY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+)
+
+BOUNDARY_WORD = "word"
+BOUNDARY_NONE = "none"
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def _expand_entry(entry, defaults):
+    """Yield (alias, boundary, case_sensitive) for a taxonomy entry and its aliases"""
+    if isinstance(entry, str):
+        entry = {"name": entry}
+
+    boundary = entry.get("boundary", defaults.get("boundary", BOUNDARY_WORD))
+    case_sensitive = entry.get("case_sensitive", defaults.get("case_sensitive", False))
+
+    yield entry["name"], boundary, case_sensitive
+    for alias in entry.get("aliases", []):
+        if isinstance(alias, str):
+            yield alias, boundary, case_sensitive
+        else:
+            yield (
+                alias["name"],
+                alias.get("boundary", boundary),
+                alias.get("case_sensitive", case_sensitive)
+            )
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill taxonomy.
+
+    Every canonical name and alias is compiled into one automaton, so a text is
+    scanned in a single pass regardless of how many skills are in the
+    taxonomy. Each alias carries its own rules: `boundary` ("word" rejects
+    matches inside a longer word, e.g. "Java" in "JavaScript"; "none" allows
+    substrings) and `case_sensitive` (for short aliases such as "ML").
+    """
+
+    def __init__(self, entries, defaults=None):
+        defaults = defaults or {}
+        self.skills = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._patterns = []
+
+        seen = set()
+        for entry in entries:
+            aliases = list(_expand_entry(entry, defaults))
+            canonical = aliases[0][0]
+            if canonical.lower() in seen:
+                continue
+            seen.add(canonical.lower())
+            skill_id = len(self.skills)
+            self.skills.append(canonical)
+
+            for alias, boundary, case_sensitive in aliases:
+                key = alias.lower()
+                if not key or (key, skill_id) in seen:
+                    continue
+                seen.add((key, skill_id))
+                pattern_id = len(self._patterns)
+                self._patterns.append((skill_id, len(key), alias, boundary == BOUNDARY_WORD, case_sensitive))
+                self._insert(key, pattern_id)
+
+        self._build_failure_links()
+        # Identifies the compiled vocabulary, e.g. for caching parse results
+        self.fingerprint = hashlib.sha1(repr(self._patterns).encode("utf-8")).hexdigest()[:16]
+
+    def _insert(self, key, pattern_id):
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _accept(self, text, lowered, start, pattern):
+        _, length, alias, word_boundary, case_sensitive = pattern
+        end = start + length
+
+        if word_boundary:
+            if start > 0 and _is_word_char(alias[0]) and _is_word_char(lowered[start - 1]):
+                return False
+            if end < len(lowered) and _is_word_char(alias[-1]) and _is_word_char(lowered[end]):
+                return False
+
+        # lower() can change the length of some non-ASCII text; offsets then
+        # no longer line up with the original, so fall back to insensitive
+        if case_sensitive and len(text) == len(lowered):
+            return text[start:end] == alias
+
+        return True
+
+    def scan(self, text):
+        """
+        Find every skill occurrence in `text`.
+
+        Returns a dict with the detected canonical `skills` (in taxonomy order),
+        and per-skill occurrence `counts` and start `offsets` into the
+        lower-cased text. Alias matches are reported under the canonical name.
+        """
+        offsets = {}
+        if text:
+            goto, fail, output, patterns = self._goto, self._fail, self._output, self._patterns
+            lowered = text.lower()
+            state = 0
+            for position, char in enumerate(lowered):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                for pattern_id in output[state]:
+                    pattern = patterns[pattern_id]
+                    start = position - pattern[1] + 1
+                    if self._accept(text, lowered, start, pattern):
+                        offsets.setdefault(pattern[0], []).append(start)
+
+        skills = [self.skills[skill_id] for skill_id in sorted(offsets)]
+        return {
+            'skills': skills,
+            'counts': {self.skills[skill_id]: len(found) for skill_id, found in offsets.items()},
+            'offsets': {self.skills[skill_id]: sorted(found) for skill_id, found in offsets.items()}
+        }
+
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """Read a taxonomy file and return (entries, defaults)"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        return data, {}
+
+    entries = data.get("skills")
+    if not isinstance(entries, list):
+        raise ValueError(f"Skill taxonomy {path} has no 'skills' list")
+    return entries, data.get("defaults", {})
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_skill_matcher(path=TAXONOMY_PATH):
+    """
+    Compiled matcher for the taxonomy at `path`.
+
+    The file is compiled once and recompiled only when its mtime changes. If a
+    reload fails, the previously compiled matcher stays in use.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            entries, defaults = load_taxonomy(path)
+            matcher = SkillMatcher(entries, defaults)
+        except Exception as e:
+            logger.error(f"Skill taxonomy load error: {e}")
+            if not cached:
+                # Nothing to fall back to; retry on the next call
+                return SkillMatcher([])
+            matcher = cached[1]
+
+        _cache[path] = (mtime, matcher)
+        return matcher
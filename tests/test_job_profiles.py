@@ -0,0 +1,33 @@
+import os
+import random
+import sys
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from job_profiles import keyword_similarity, term_counts  # noqa: E402
+
+
+def sklearn_similarity(resume_text, job_description):
+    matrix = TfidfVectorizer(stop_words='english', max_features=100).fit_transform([resume_text, job_description])
+    return cosine_similarity(matrix[0:1], matrix[1:2])[0][0]
+
+
+def test_matches_sklearn_when_ties_straddle_the_feature_limit():
+    rng = random.Random(0)
+    words = [f"term{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(400)]
+    for _ in range(50):
+        resume_text = " ".join(rng.choice(words) for _ in range(rng.randint(150, 500)))
+        job_description = " ".join(rng.choice(words) for _ in range(rng.randint(50, 150)))
+        expected = sklearn_similarity(resume_text, job_description)
+        actual = keyword_similarity(term_counts(resume_text), term_counts(job_description))
+        assert abs(actual - expected) < 1e-12
+
+
+def test_small_vocabulary_keeps_every_term():
+    resume_text = "python django postgresql docker"
+    job_description = "python flask docker"
+    expected = sklearn_similarity(resume_text, job_description)
+    assert abs(keyword_similarity(term_counts(resume_text), term_counts(job_description)) - expected) < 1e-12
@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pdf_cache  # noqa: E402
+from pdf_cache import DocumentCache  # noqa: E402
+
+
+def test_total_tracks_puts_replacements_and_evictions(tmp_path):
+    cache = DocumentCache(str(tmp_path / "cache.sqlite3"), max_bytes=25)
+    cache.put_text("a", "x" * 10)
+    cache.put_text("b", "x" * 10)
+    cache.put_text("a", "x" * 5)
+    assert cache.stats()['bytes'] == 15
+
+    cache.put_text("c", "x" * 10)
+    cache.put_text("d", "x" * 10)
+    assert cache.stats()['bytes'] <= 25
+    assert cache.stats()['bytes'] == sum(
+        len(cache.get_text(key) or "") for key in "abcd"
+    )
+    assert cache.get_text("d") == "x" * 10
+
+
+def test_recently_read_entries_survive_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "TOUCH_BATCH", 1)
+    cache = DocumentCache(str(tmp_path / "cache.sqlite3"), max_bytes=30)
+    for key in "abc":
+        cache.put_text(key, "x" * 10)
+    assert cache.get_text("a") is not None
+
+    cache.put_text("d", "x" * 10)
+    assert cache.get_text("a") is not None
+    assert cache.get_text("b") is None
+
+
+def test_hits_are_not_written_until_a_batch_is_due(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = DocumentCache(path)
+    cache.put_text("a", "text")
+    before = sqlite3.connect(path).execute("SELECT last_access FROM entries").fetchone()[0]
+
+    cache.get_text("a")
+    assert sqlite3.connect(path).execute("SELECT last_access FROM entries").fetchone()[0] == before
+
+    cache.put_text("b", "text")
+    assert sqlite3.connect(path).execute("SELECT last_access FROM entries WHERE key = 'text:a'").fetchone()[0] > before
+
+
+def test_existing_cache_is_summed_once(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)")
+    conn.execute("INSERT INTO entries VALUES ('text:a', 'abc', 3, 0)")
+    conn.commit()
+
+    assert DocumentCache(path).stats() == {'entries': 1, 'bytes': 3, 'max_bytes': pdf_cache.MAX_CACHE_BYTES}
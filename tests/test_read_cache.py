@@ -0,0 +1,74 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import read_cache  # noqa: E402
+from read_cache import SWEEP_INTERVAL, ReadCache, cached_read  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_expired_entry_is_dropped_and_refetched(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(read_cache.time, "monotonic", clock)
+    cache = ReadCache()
+
+    assert cache.get_or_fetch("scores", "p1", 5, lambda: 1) == 1
+    assert cache.get_or_fetch("scores", "p1", 5, lambda: 2) == 1
+    clock.now += 10
+    assert cache.get_or_fetch("scores", "p1", 5, lambda: 2) == 2
+    assert len(cache._entries) == 1
+
+
+def test_sweep_drops_expired_entries_that_are_never_read_again(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(read_cache.time, "monotonic", clock)
+    cache = ReadCache()
+
+    for participant in range(100):
+        cache.get_or_fetch("scores", participant, 5, lambda: participant)
+    clock.now += SWEEP_INTERVAL
+    cache.get_or_fetch("scores", "new", 5, lambda: 0)
+
+    assert list(cache._entries) == [("scores", "new")]
+
+
+def test_failed_fetch_is_not_cached(monkeypatch):
+    cache = ReadCache()
+    monkeypatch.setattr(read_cache, "read_cache", cache)
+    responses = [Exception("connection reset"), ["row"]]
+
+    @cached_read(ttl=60, fallback=list)
+    def get_rows():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert get_rows() == []
+    assert get_rows() == ["row"]
+    assert get_rows() == ["row"]
+    assert cache.stats()[0]['errors'] == 1
+    assert cache.stats()[0]['hits'] == 1
+
+
+def test_without_fallback_the_error_reaches_the_caller(monkeypatch):
+    monkeypatch.setattr(read_cache, "read_cache", ReadCache())
+
+    @cached_read(ttl=60)
+    def get_rows():
+        raise Exception("connection reset")
+
+    try:
+        get_rows()
+    except Exception as e:
+        assert str(e) == "connection reset"
+    else:
+        raise AssertionError("expected the fetch error")
@@ -0,0 +1,39 @@
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from rules import date_ranges, employment_intervals, months_covered  # noqa: E402
+
+TODAY = date(2026, 10, 18)
+
+
+def covered(text):
+    return months_covered([(first, last) for first, last, _, _ in date_ranges(text)], today=TODAY)
+
+
+def test_explicit_end_month_is_included():
+    assert covered("Software Engineer, Jan 2019 - Dec 2021") == 36
+    assert covered("Intern, Jan 2020 - Dec 2020") == 12
+    assert covered("Analyst, 06/2017 to 08/2019") == 27
+
+
+def test_back_to_back_jobs_add_up():
+    assert covered("Acme, Jan 2019 – Dec 2019\nGlobex, Jan 2020 – Dec 2020") == 24
+
+
+def test_overlapping_jobs_count_once():
+    assert covered("Acme, Jan 2019 - Jun 2020\nGlobex, Mar 2020 - Dec 2020") == 24
+    assert covered("Acme, Jan 2019 - Dec 2021\nGlobex, Mar 2020 - Jun 2020") == 36
+
+
+def test_bare_years_and_present():
+    assert covered("Acme, 2019 - 2021") == 24
+    assert covered("Acme, Jan 2026 - Present") == 10
+    assert covered("Acme, 2019 - 2019") == 0
+
+
+def test_employment_end_is_the_last_month_worked():
+    employment = [{'start': '2019-01', 'end': '2019-12'}, {'start': '2020-01', 'end': None}]
+    assert months_covered(employment_intervals(employment), today=TODAY) == 12 + 82
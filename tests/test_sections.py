@@ -0,0 +1,72 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sections import section_text, segment_sections  # noqa: E402
+
+RESUME = """Jane Doe
+jane@thapar.edu
+
+{projects}
+{project_name}
+Built a web app with Python and Django.
+
+{education}
+M.Tech in Computer Science, CGPA 8.5/10
+
+SKILLS
+Python, Django, SQL
+"""
+
+
+def sections_of(project_name="Voting System", projects="PROJECTS", education="EDUCATION"):
+    text = RESUME.format(project_name=project_name, projects=projects, education=education)
+    sections = segment_sections(text)
+    return {name: section_text(text, sections, name) for name in sections}
+
+
+def test_caps_headings():
+    sections = sections_of()
+    assert sections['projects'] == "Voting System\nBuilt a web app with Python and Django."
+    assert sections['education'].startswith("M.Tech")
+    assert sections['skills'] == "Python, Django, SQL"
+
+
+def test_lowercase_headings():
+    sections = sections_of(projects="projects", education="education")
+    assert sections['projects'].startswith("Voting System")
+    assert sections['education'].startswith("M.Tech")
+
+
+def test_title_case_and_decorated_headings():
+    sections = sections_of(projects="Academic Projects:", education="2. Education Details")
+    assert sections['projects'].startswith("Voting System")
+    assert sections['education'].startswith("M.Tech")
+
+
+def test_project_names_with_section_keywords_stay_in_the_body():
+    for name in ("Online Certificate Generator", "Skill Swap Platform", "Education Portal"):
+        sections = sections_of(project_name=name)
+        assert sections['projects'].startswith(name), name
+        assert sections['projects'].endswith("Django."), name
+        assert sections['education'].startswith("M.Tech"), name
+        assert 'certifications' not in sections, name
+
+
+def test_sentence_mentioning_a_keyword_is_not_a_heading():
+    sections = sections_of(project_name="Led the project in Python")
+    assert sections['projects'].startswith("Led the project")
+
+
+def test_inline_heading_body():
+    text = "Skills: Python, SQL\nWork History\nAnalyst at Acme, 2019 - 2022\n"
+    sections = segment_sections(text)
+    assert section_text(text, sections, 'skills') == "Python, SQL"
+    assert section_text(text, sections, 'experience') == "Analyst at Acme, 2019 - 2022"
+
+
+def test_repeated_heading_of_current_section_continues_it():
+    text = "PROJECTS\nProject: Voting App\nBuilt with Flask\nEDUCATION\nB.Tech\n"
+    sections = segment_sections(text)
+    assert section_text(text, sections, 'projects') == "Project: Voting App\nBuilt with Flask"
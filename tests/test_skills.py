@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from skills import SkillMatcher, get_skill_matcher  # noqa: E402
+
+ENTRIES = [
+    {"name": "Java"},
+    {"name": "JavaScript", "aliases": ["ECMAScript"]},
+    {"name": "HTML", "aliases": ["HTML5"]},
+    {"name": "Machine Learning", "aliases": [{"name": "ML", "case_sensitive": True}]},
+    {"name": "React", "aliases": ["ReactJS"]},
+]
+
+
+def skills(text, entries=ENTRIES):
+    return SkillMatcher(entries).scan(text)['skills']
+
+
+def test_word_boundary_rejects_matches_inside_longer_words():
+    assert skills("JavaScript and TypeScript") == ["JavaScript"]
+    assert skills("Java, JavaScript") == ["Java", "JavaScript"]
+    assert skills("Reactive programming") == []
+
+
+def test_case_sensitive_alias():
+    assert skills("Built ML pipelines") == ["Machine Learning"]
+    assert skills("HTML and CSS") == ["HTML"]
+    assert skills("one ml of water") == []
+
+
+def test_aliases_are_reported_under_the_canonical_name():
+    result = SkillMatcher(ENTRIES).scan("ReactJS front end, ECMAScript 6, HTML5")
+    assert result['skills'] == ["JavaScript", "HTML", "React"]
+    assert result['counts'] == {"JavaScript": 1, "HTML": 1, "React": 1}
+    assert result['offsets']['React'] == [0]
+
+
+def test_shipped_taxonomy_keeps_common_suffix_forms():
+    found = get_skill_matcher().scan("ReactJS, Dockerized services, Python3, GitHub Actions")['skills']
+    assert {"React", "Docker", "Python", "Git"} <= set(found)
+
+
+def test_reloads_when_the_file_changes(tmp_path):
+    path = str(tmp_path / "taxonomy.json")
+    with open(path, "w") as f:
+        json.dump({"skills": [{"name": "Python"}]}, f)
+    first = get_skill_matcher(path)
+    assert get_skill_matcher(path) is first
+
+    with open(path, "w") as f:
+        json.dump({"skills": [{"name": "Python"}, {"name": "Rust"}]}, f)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+    second = get_skill_matcher(path)
+    assert second is not first
+    assert second.scan("Python and Rust")['skills'] == ["Python", "Rust"]
+
+    with open(path, "w") as f:
+        f.write("{not json")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 2_000_000))
+    assert get_skill_matcher(path) is second